@@ -0,0 +1,328 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# benchmarks/run_benchmarks.py
+#
+# Headless benchmarks for the capture -> detection -> UI -> speech pipeline.
+#   python -m benchmarks.run_benchmarks [--recording DIR] [--output FILE] [--baseline FILE]
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from modules.sysinfo import peak_memory_mb
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def summarize(samples_s, peak_bytes, frame_bytes):
+    ms = np.array(samples_s) * 1000
+    mean = float(ms.mean())
+    return {
+        "iterations": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "mean_ms": round(mean, 4),
+        "fps": round(1000 / mean, 1) if mean > 0 else None,
+        "peak_alloc_kb": round(peak_bytes / 1024, 1),
+        # Mean of the memory each iteration allocated on top of what it
+        # started with, freed or not (tracemalloc sees numpy buffers too)
+        "alloc_kb_per_iter": round(float(np.mean(frame_bytes)) / 1024, 2) if frame_bytes else 0.0,
+    }
+
+
+def measure(fn, iterations, warmup=5, memory_iterations=50):
+    for i in range(warmup):
+        fn(i)
+
+    samples = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+
+    # Separate pass so tracemalloc overhead stays out of the timings
+    tracemalloc.start()
+    peak = 0
+    frame_bytes = []
+    for i in range(min(iterations, memory_iterations)):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(i)
+        _, iteration_peak = tracemalloc.get_traced_memory()
+        frame_bytes.append(iteration_peak - before)
+        peak = max(peak, iteration_peak)
+    tracemalloc.stop()
+    return summarize(samples, peak, frame_bytes)
+
+
+# ── Stages ───────────────────────────────────────────────────────────────────
+
+def bench_tracker(recording, iterations):
+    from modules.eye_tracker import EyeTracker
+
+    if recording:
+        from modules.camera_replay import ReplayCamera
+        source = ReplayCamera(recording, realtime=False, loop=True)
+        frames = None
+    else:
+        source = None
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, FRAME_SHAPE, dtype=np.uint8) for _ in range(8)]
+
+    # Never idle: every frame should pay for a full detection
+    tracker = EyeTracker(None, idle_after_frames=10 ** 9)
+    pool = tracker.frame_pool
+    blinks = [0]
+
+    def step(i):
+        if i == 0:
+            # Each measure() pass restarts at 0; by then warm-up has sized
+            # every buffer, so anything counted from here is a per-frame leak
+            pool.allocations_per_frame()
+        if source is not None:
+            frame, stamp = source.get_latest(pool.get("capture", FRAME_SHAPE))
+        else:
+            frame, stamp = frames[i % len(frames)], i / 30
+        if tracker.process(frame, timestamp=stamp).blink:
+            blinks[0] += 1
+
+    result = measure(step, iterations)
+    result["blinks"] = blinks[0]
+    result["avg_inference_ms"] = round(tracker.avg_inference_ms, 3)
+    result["pool_allocations"] = pool.allocations
+    result["pool_allocations_per_frame"] = round(pool.allocations_per_frame(), 4)
+    return result
+
+
+def bench_blink(iterations):
+    from modules.blink_detector import BlinkDetector
+
+    detector = BlinkDetector()
+    eye = np.array([[0, 0], [10, -5], [20, -5], [30, 0], [20, 5], [10, 5]], dtype=float)
+    open_eyes = np.stack([eye, eye + 100])
+    closed_eyes = open_eyes * (1, 0.1)
+    blinks = [0]
+
+    def step(i):
+        # 30 fps with a 200 ms closure every second
+        points = closed_eyes if i % 30 < 6 else open_eyes
+        if detector.update(points, i / 30):
+            blinks[0] += 1
+
+    result = measure(step, iterations)
+    result["blinks"] = blinks[0]
+    return result
+
+
+def make_ui():
+    from ui.interface import EyeSpeakInterface
+    return EyeSpeakInterface()
+
+
+def bench_draw_ui(ui, screen, iterations):
+    base = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    work = np.empty_like(base)
+
+    ui.text_buffer = "HELLO WOR"
+    ui.selection_mode = ui.in_phrase_panel = ui.quit_confirm = False
+    if screen == "phrases":
+        ui.in_phrase_panel = True
+        ui.phrase_index = 0
+    elif screen == "confirm":
+        ui.selection_mode = True
+        ui.pending_char = "L"
+    elif screen == "quit":
+        ui.quit_confirm = True
+
+    frames = [0]
+
+    def step(i):
+        np.copyto(work, base)
+        if screen == "keyboard":
+            # The highlight moves once per 1.5 s scan step, ~45 frames at 30 fps.
+            # It keeps moving across measure() passes, so the memory pass
+            # builds new layers as the app does rather than hitting the ones
+            # the timing pass left in the cache
+            ui.key_index = (frames[0] // 45) % len(ui.key_order)
+            frames[0] += 1
+        ui.draw_ui(work)
+
+    result = measure(step, iterations)
+    ui.selection_mode = ui.in_phrase_panel = ui.quit_confirm = False
+    return result
+
+
+def bench_valid_keys(ui, iterations, cold):
+    words = list(ui.word_index)
+    rng = random.Random(0)
+    prefixes = []
+    for _ in range(iterations):
+        word = words[rng.randrange(len(words))]
+        prefixes.append(word[:rng.randint(1, len(word))])
+
+    def step(i):
+        if cold:
+            ui.word_index._next_cache.clear()
+        ui.text_buffer = prefixes[i % len(prefixes)]
+        ui.update_valid_keys()
+
+    return measure(step, iterations)
+
+
+def bench_predictions(ui, iterations):
+    words = list(ui.word_index)
+    rng = random.Random(1)
+    prefixes = []
+    for _ in range(iterations):
+        word = words[rng.randrange(len(words))]
+        prefixes.append(word[:rng.randint(1, len(word))])
+
+    def step(i):
+        ui.predictor.complete(prefixes[i % len(prefixes)])
+
+    return measure(step, iterations)
+
+
+def bench_speech(iterations):
+    from modules.speech_engine import SpeechEngine
+
+    class SilentSpeechEngine(SpeechEngine):
+        # Spawns a trivial process instead of espeak so CI needs no audio
+        def command(self, text, wav_path=None):
+            return [sys.executable, "-c", "pass"]
+
+    engine = SilentSpeechEngine()
+    completion = []
+
+    def step(i):
+        queued_at = time.perf_counter()
+        engine.say(f"utterance {i}", on_done=lambda text, ok: completion.append(time.perf_counter() - queued_at))
+        engine.wait()
+
+    enqueue = []
+
+    def enqueue_step(i):
+        started = time.perf_counter()
+        engine.say(f"utterance {i}")
+        enqueue.append(time.perf_counter() - started)
+        engine.cancel()
+
+    result = measure(step, iterations, warmup=2, memory_iterations=10)
+    measure(enqueue_step, iterations, warmup=0, memory_iterations=0)
+    engine.stop()
+    result["enqueue_p99_ms"] = round(float(np.percentile(np.array(enqueue) * 1000, 99)), 4)
+    return result
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+def run(args):
+    results = {}
+
+    def stage(name, fn, *fn_args):
+        print(f"[INFO] Benchmarking {name}...")
+        try:
+            results[name] = fn(*fn_args)
+        except ImportError as e:
+            print(f"[WARNING] Skipping {name}: {e}")
+            results[name] = {"skipped": str(e)}
+
+    n = args.iterations
+    stage("tracker", bench_tracker, args.recording, max(n // 4, 20))
+    stage("blink_detector", bench_blink, n * 10)
+
+    ui = make_ui()
+    for screen in ("keyboard", "phrases", "confirm", "quit"):
+        stage(f"draw_ui_{screen}", bench_draw_ui, ui, screen, n)
+    stage("valid_keys_cold", bench_valid_keys, ui, n * 10, True)
+    stage("valid_keys_warm", bench_valid_keys, ui, n * 10, False)
+    stage("word_predictions", bench_predictions, ui, n * 10)
+    stage("speech_queue", bench_speech, max(n // 10, 10))
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "recording": args.recording,
+            "iterations": n,
+        },
+        "peak_rss_mb": peak_memory_mb(),
+        "stages": results,
+    }
+
+
+def compare(report, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = []
+    for name, result in report["stages"].items():
+        before = baseline.get("stages", {}).get(name, {})
+        if "p50_ms" in result and "p50_ms" in before and before["p50_ms"] > 0:
+            change = result["p50_ms"] / before["p50_ms"] - 1
+            if change > tolerance:
+                regressions.append(f"{name}: p50 {before['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms (+{change:.0%})")
+    return regressions
+
+
+def print_report(report):
+    print(f"\n{'stage':<20}{'p50 ms':>10}{'p99 ms':>10}{'fps':>10}{'alloc KB':>10}{'KB/iter':>10}")
+    for name, result in report["stages"].items():
+        if "skipped" in result:
+            print(f"{name:<20}{'skipped':>10}")
+            continue
+        print(f"{name:<20}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+              f"{result['fps'] or 0:>10.1f}{result['peak_alloc_kb']:>10.1f}{result['alloc_kb_per_iter']:>10.2f}")
+    if report["peak_rss_mb"] is not None:
+        print(f"\npeak RSS: {report['peak_rss_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run EyeSpeak Assist benchmarks without a display or camera")
+    parser.add_argument("--recording", help="camera_replay recording for the tracker stage (default: synthetic frames)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", default="bench_output.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier results to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown vs baseline")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"[ERROR] Regression in {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+# benchmarks/scan_simulator.py
+#
+# Types a text corpus through the real keyboard logic without a camera and
+# counts scan intervals per committed character for each scan mode.
+#   python -m benchmarks.scan_simulator [CORPUS] [--modes linear adaptive row_column]
+import argparse
+import json
+import re
+
+from ui.interface import EyeSpeakInterface, SCAN_MODES
+
+MAX_STEPS = 500
+# Relative to the project folder, like prediction.counts_path
+DEFAULT_COUNTS = "assets/dict/word-counts.txt"
+
+
+class SimulatedUser:
+    # Blinks at the first highlighted entry that moves the message forward
+    # (the next letter, or the word being typed if it is predicted) and
+    # always confirms.
+    def __init__(self, ui):
+        self.ui = ui
+        self.steps = 0
+        self.selections = 0
+        self.chars = 0
+
+    def reach(self, targets):
+        ui = self.ui
+        for _ in range(MAX_STEPS):
+            ui.update_valid_keys()
+            current = ui.key_order[ui.key_index]
+            if current in targets:
+                return current
+            ui.advance_key()
+            self.steps += 1
+        raise RuntimeError(f"{targets} never came up in the scan")
+
+    def blink(self):
+        self.selections += 1
+        return self.ui.blink_triggered()
+
+    def select(self, targets):
+        ui = self.ui
+        ui.update_valid_keys()
+        if ui.scan_mode == "row_column" and ui.scan_group is None:
+            rows = {}
+            for entry in targets:
+                rows.setdefault(self.row_of(entry), entry)
+            row = self.reach(rows)
+            self.blink()
+            targets = [rows[row]]
+        entry = self.reach(targets)
+        self.blink()
+        # YES is highlighted first
+        return entry, self.blink()
+
+    def row_of(self, entry):
+        for row, entries in self.ui.scan_groups.items():
+            if entry in entries:
+                return row
+        raise RuntimeError(f"{entry} is not in any row")
+
+    def type_line(self, words):
+        ui = self.ui
+        for n, word in enumerate(words):
+            last = n == len(words) - 1
+            typed = ""
+            while typed != word:
+                ui.update_valid_keys()
+                targets = [("KEY", word[len(typed)])]
+                if word in ui.predictions:
+                    targets.append(("WORD", ui.predictions.index(word)))
+                entry, _ = self.select(targets)
+                if entry[0] == "WORD":
+                    # The completion comes with its space
+                    self.chars += len(word) - len(typed) + (0 if last else 1)
+                    break
+                typed += word[len(typed)]
+                self.chars += 1
+            else:
+                if not last:
+                    self.select([("KEY", ".")])
+                    self.chars += 1
+        _, result = self.select([("KEY", "-")])
+        if result == "ENTER":
+            ui.text_buffer = ""
+        self.chars += 1
+
+
+def read_corpus(path):
+    if path is None:
+        return EyeSpeakInterface({"enabled": False}).phrases
+    with open(path, "r", encoding="utf-8") as f:
+        return [line for line in f if line.strip()]
+
+
+def simulate(lines, mode, prediction=True, counts_path=DEFAULT_COUNTS):
+    ui = EyeSpeakInterface({"enabled": prediction, "counts_path": counts_path}, {"mode": mode})
+    user = SimulatedUser(ui)
+    skipped = 0
+    for line in lines:
+        # Only dictionary words can be spelled: other letters are greyed out
+        words = [w for w in re.findall(r"[A-Z]+", line.upper())]
+        typeable = [w for w in words if w in ui.word_index]
+        skipped += len(words) - len(typeable)
+        if typeable:
+            user.type_line(typeable)
+    return {
+        "mode": mode,
+        "prediction": prediction,
+        "counts": counts_path,
+        "chars": user.chars,
+        "steps_per_char": user.steps / user.chars if user.chars else 0.0,
+        "selections_per_char": user.selections / user.chars if user.chars else 0.0,
+        "skipped_words": skipped,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate scan steps per character on a text corpus")
+    parser.add_argument("corpus", nargs="?", help="text file, one message per line (default: ui/phrases.yml)")
+    parser.add_argument("--modes", nargs="+", choices=SCAN_MODES, default=list(SCAN_MODES))
+    parser.add_argument("--no-prediction", action="store_true", help="leave the word completion row out")
+    parser.add_argument("--counts", default=DEFAULT_COUNTS, help=f"unigram counts to rank words by (default: {DEFAULT_COUNTS})")
+    parser.add_argument("--no-counts", action="store_true", help="rank words without counts")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    lines = read_corpus(args.corpus)
+    counts_path = None if args.no_counts else args.counts
+    results = [simulate(lines, mode, prediction=not args.no_prediction, counts_path=counts_path)
+               for mode in args.modes]
+
+    print(f"\n{'mode':<12} {'chars':>7} {'steps/char':>11} {'blinks/char':>12} {'skipped':>8}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['chars']:>7} {r['steps_per_char']:>11.2f} "
+              f"{r['selections_per_char']:>12.2f} {r['skipped_words']:>8}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[INFO] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
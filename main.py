@@ -20,26 +20,26 @@
 
 import cv2
 import time
-import pygame
-import pyautogui
-import os
+import threading
 import numpy as np
-from modules.eye_tracker import EyeTracker
-from modules.speech_engine import SpeechEngine
-from modules.camera import Camera  
-from ui.interface import EyeSpeakInterface
+from modules.settings import load_settings
+from modules.metrics import Metrics
+from modules.display import DisplayPipeline
+from modules.startup import Startup
 
-import pyautogui
+# mediapipe, pygame and pyautogui take a while to import; each is imported
+# by the startup task that needs it, in parallel with the splash screen
 
-def show_splash_screen():
+def screen_size():
+    import pyautogui
+    return pyautogui.size()
+
+def show_splash_screen(screen_width, screen_height):
     splash = cv2.imread("assets/images/splash.png")
     if splash is None:
         print("[WARNING] Splash image not found.")
         return
 
-    # Get actual screen resolution using pyautogui
-    screen_width, screen_height = pyautogui.size()
-
     splash = cv2.resize(splash, (screen_width, screen_height))
     window_name = "EyeSpeak Splash"
 
@@ -66,17 +66,48 @@ def show_splash_screen():
 
     cv2.destroyWindow(window_name)
 
-def wait_for_camera():
-    from modules.camera import Camera
+def open_camera(camera_settings, cancelled, max_wait_time=5):
+    from modules.camera import camera_from_settings
+    from modules.camera_replay import RecordingCamera, ReplayCamera
+
+    if camera_settings.get("replay_path"):
+        return ReplayCamera(
+            camera_settings["replay_path"],
+            realtime=camera_settings.get("replay_realtime", True),
+            loop=camera_settings.get("replay_loop", True),
+        )
+
+    start_time = time.time()
+    while time.time() - start_time < max_wait_time and not cancelled.is_set():
+        try:
+            print("[DEBUG] Trying to initialize camera...")
+            camera = camera_from_settings(camera_settings)
+            frame = camera.get_frame()
+            if frame is not None:
+                if camera_settings.get("record_path"):
+                    camera = RecordingCamera(camera, camera_settings["record_path"])
+                return camera
+            print("[DEBUG] Camera.get_frame() returned None.")
+            # Release the device too, or the next attempt finds it busy
+            camera.close()
+        except Exception as e:
+            print(f"[ERROR] Exception while initializing camera: {e}")
+        cancelled.wait(0.05)
+
+    print("[ERROR] Camera initialization failed.")
+    return None
+
+def wait_for_camera(startup, cancelled, max_wait_time=5):
+    # The camera is usually open by the time the splash ends; the progress
+    # window only appears while it is still being set up
+    if startup.done("camera"):
+        return startup.result("camera")
 
     window_name = "Initializing EyeSpeak"
     width, height = 800, 200
     bar_length = 600
     bar_height = 40
-    max_wait_time = 5  # seconds
     start_time = time.time()
-    camera_ready = False
-    camera = None
 
     cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
     cv2.resizeWindow(window_name, width, height)
@@ -84,9 +115,9 @@ def wait_for_camera():
 
     progress = 0
 
-    while time.time() - start_time < max_wait_time:
+    while not startup.done("camera"):
         elapsed = time.time() - start_time
-        progress = int((elapsed / max_wait_time) * bar_length)
+        progress = min(bar_length, int((elapsed / max_wait_time) * bar_length))
 
         screen = 255 * np.ones((height, width, 3), dtype=np.uint8)
         cv2.putText(screen, "Initializing Camera...", (100, 80), cv2.FONT_HERSHEY_SIMPLEX, 1, (50, 50, 50), 2)
@@ -97,25 +128,12 @@ def wait_for_camera():
         key = cv2.waitKey(50)
         if key == 27:
             print("[INFO] User cancelled camera init.")
+            cancelled.set()
             cv2.destroyWindow(window_name)
             return None
 
-        if not camera_ready:
-            try:
-                print("[DEBUG] Trying to initialize camera...")
-                camera = Camera()
-                frame = camera.get_frame()
-                if frame is not None:
-                    camera_ready = True
-                    break
-                else:
-                    print("[DEBUG] Camera.get_frame() returned None.")
-            except Exception as e:
-                print(f"[ERROR] Exception while initializing camera: {e}")
-                camera = None
-
-    if not camera_ready:
-        print("[ERROR] Camera initialization failed.")
+    camera = startup.result("camera")
+    if camera is None:
         cv2.destroyWindow(window_name)
         return None
 
@@ -128,77 +146,250 @@ def wait_for_camera():
         if cv2.waitKey(20) == 27:
             print("[INFO] User cancelled during final animation.")
             cv2.destroyWindow(window_name)
+            camera.stop()
             return None
 
     cv2.waitKey(500)
     cv2.destroyWindow(window_name)
     return camera
 
-def main():
-    show_splash_screen()
-    camera = wait_for_camera()
-    if camera is None:
-        return
-
-    tracker = EyeTracker(camera=camera)
-    speech = SpeechEngine()
-    ui = EyeSpeakInterface()
-    pygame.init()
+def create_tracker(tracker_settings, blink_settings):
+    from modules.eye_tracker import EyeTracker
+
+    # The camera is attached once it is open
+    return EyeTracker(
+        camera=None,
+        roi_tracking=tracker_settings.get("roi_tracking", False),
+        roi_padding=tracker_settings.get("roi_padding", 0.3),
+        inference_scale=tracker_settings.get("inference_scale", 1.0),
+        idle_after_frames=tracker_settings.get("idle_after_frames", 90),
+        idle_probe_hz=tracker_settings.get("idle_probe_hz", 2.0),
+        blink_engine=tracker_settings.get("blink_engine", "ear"),
+        blink_settings=blink_settings,
+    )
+
+def create_interface(prediction_settings, scan_settings):
+    from ui.interface import EyeSpeakInterface
+    return EyeSpeakInterface(prediction_settings=prediction_settings, scan_settings=scan_settings)
+
+def init_audio():
+    try:
+        import pygame
+    except ImportError:
+        print("[ERROR] pygame not installed - continuing without sound")
+        return None
     try: 
         pygame.mixer.init()
-        select_sound = pygame.mixer.Sound("assets/sounds/boop-3.wav")
+        return pygame.mixer.Sound("assets/sounds/boop-3.wav")
     except pygame.error:
         print("[ERROR] Audio not available - continuing without sound")
-        select_sound = None
+        return None
+
+def create_speech_cache(speech_settings):
+    from modules.speech_cache import SpeechCache, DEFAULT_CACHE_DIR
+    return SpeechCache(
+        directory=speech_settings.get("cache_dir", DEFAULT_CACHE_DIR),
+        max_bytes=int(speech_settings.get("cache_max_mb", 64) * 1024 * 1024),
+    )
+
+def create_event_log(event_settings, user):
+    from modules.event_log import EventLog, DEFAULT_LOG_DIR
+    return EventLog(
+        directory=event_settings.get("directory", DEFAULT_LOG_DIR),
+        user=event_settings.get("user", user),
+        max_bytes=int(event_settings.get("max_mb", 4) * 1024 * 1024),
+    )
+
+def create_speech(speech_settings, speech_cache):
+    from modules.speech_engine import SpeechEngine
+    return SpeechEngine(
+        rate=speech_settings.get("rate", 140),
+        pitch=speech_settings.get("pitch", 70),
+        cache=speech_cache,
+        backend=speech_settings.get("backend", "espeak"),
+        speculative=speech_settings.get("speculative", False),
+    )
+
+def main():
+    settings = load_settings()
+    calibration = settings.get("blink_calibration")
+    if calibration:
+        print(f"[INFO] Blink profile calibrated for {calibration.get('user')} at {calibration.get('calibrated_at')}")
+    tracker_settings = settings.get("tracker", {})
+    speech_settings = settings.get("speech", {})
+
+    startup = Startup()
+    camera_cancelled = threading.Event()
+    startup.add("screen", screen_size)
+    startup.add("camera", lambda: open_camera(settings.get("camera", {}), camera_cancelled))
+    startup.add("face_mesh", lambda: create_tracker(tracker_settings, settings.get("blink")))
+    startup.add("interface", lambda: create_interface(settings.get("prediction"), settings.get("scan")))
+    startup.add("audio", init_audio)
+    startup.add("speech_cache", lambda: create_speech_cache(speech_settings))
+    startup.add("speech", lambda cache: create_speech(speech_settings, cache), "speech_cache")
+    # Loading phrase audio needs the mixer
+    startup.add("prewarm", lambda speech, ui, _: speech.prewarm(ui.phrases), "speech", "interface", "audio")
+
+    screen_w, screen_h = startup.result("screen")
+    show_splash_screen(screen_w, screen_h)
+    startup.mark("splash_done")
+
+    camera = wait_for_camera(startup, camera_cancelled)
+    if camera is None:
+        startup.report()
+        startup.shutdown()
+        return
 
-    screen_w, screen_h = pyautogui.size()    
+    tracker = startup.result("face_mesh")
+    tracker.cap = camera
+    # Frame pacing while nobody is in view: keep the UI alive at a low rate
+    idle_wait = 1.0 / tracker_settings.get("idle_fps", 10)
+    speech = startup.result("speech")
+    ui = startup.result("interface")
+    select_sound = startup.result("audio")
+    startup.mark("ready")
+
+    event_settings = settings.get("events", {})
+    if event_settings.get("enabled", False):
+        # Named after the calibrated user unless events.user says otherwise
+        ui.events = create_event_log(event_settings, (calibration or {}).get("user", "default"))
+
+    metrics_settings = settings.get("metrics", {})
+    metrics = Metrics(
+        enabled=metrics_settings.get("enabled", True),
+        window=metrics_settings.get("window", 300),
+        export_path=metrics_settings.get("export_path"),
+        export_interval=metrics_settings.get("export_interval", 10.0),
+    )
+    show_overlay = metrics_settings.get("overlay", False)
+
+    display_settings = settings.get("display", {})
+    display = DisplayPipeline(
+        screen_w, screen_h,
+        interpolation=display_settings.get("interpolation", "linear"),
+        preview_scale=display_settings.get("preview_scale", 1.0),
+    )
 
     cv2.namedWindow("EyeSpeak Interface", cv2.WINDOW_NORMAL)
     cv2.setWindowProperty("EyeSpeak Interface", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
 
+    # Scan steps, linger phases and the blink cooldown run on the
+    # interface's scheduler; the loop sleeps until the next of those events
+    # or the next camera frame. Window events are still pumped this often
+    # when neither comes.
+    scheduler = ui.scheduler
+    max_wait = 0.1
+
     try:
-        last_update = time.time()
-        interval = 1.5
+        fps_started_at = time.perf_counter()
+        fps_frames = 0
+        # Last mirrored camera frame; redrawn as is when only the scan moved
+        camera_frame = None
+        # Frames are copied out of the capture ring into one reused buffer
+        frame_pool = tracker.frame_pool
+        capture_shape = None
 
         while True:
-            frame = camera.get_frame()
-            if frame is None:
-                continue
-
-            frame, _, blink, _ = tracker.get_frame()
-            
-            current_time = time.time()
-            if current_time - last_update > interval:
-                if not ui.selection_mode:
-                    if not ui.just_spoke_phrase:
-                        ui.advance_key()
+            loop_started = time.perf_counter()
+
+            with metrics.span("wait"):
+                if tracker.idle:
+                    if not scheduler.pending("idle_frame"):
+                        scheduler.after("idle_frame", idle_wait)
+                    time.sleep(scheduler.time_until_next())
+                    frame_ready = scheduler.due("idle_frame")
                 else:
-                    ui.toggle_confirmation()
-                last_update = current_time
-
-            if blink:
+                    scheduler.cancel("idle_frame")
+                    frame_ready = camera.wait_for_frame(scheduler.time_until_next(limit=max_wait))
+
+            blink = False
+            if frame_ready or camera_frame is None:
+                # Capture once and share the frame between detection and drawing
+                with metrics.span("capture"):
+                    out = frame_pool.get("capture", capture_shape) if capture_shape else None
+                    frame, captured_at = camera.get_latest(out)
+                if frame is None:
+                    continue
+                capture_shape = frame.shape
+
+                with metrics.span("detect"):
+                    result = tracker.process(frame, timestamp=captured_at)
+                camera_frame, blink = result.frame, result.blink
+
+            ui.tick()
+
+            if blink and not ui.blink_ready():
+                ui.log_event("blink_ignored")
+            elif blink:
+                ui.log_event("blink")
                 if select_sound:
                     select_sound.play()
+                # Blink captured by the sensor -> selection sound started
+                metrics.record("blink_to_feedback", time.monotonic() - captured_at)
                 result = ui.blink_triggered()
                 if result == "ENTER":
                     sentence = ui.text_buffer.strip()
                     if sentence:
                         print(f"[INFO] Speaking: {sentence}")
                         speech.say(sentence)
+                        ui.log_event("speak", chars=len(sentence), phrase=False)
                         ui.text_buffer = ""
                 elif result:
                     print(f"[INFO] Speaking Phrase: {result}")
                     speech.say(result)
-
-            frame = ui.draw_ui(frame)
-            frame = cv2.resize(frame, (screen_w, screen_h))
-        
-            cv2.imshow("EyeSpeak Interface", frame)
-            if cv2.waitKey(1) & 0xFF == 27:  # ESC to exit
+                    ui.log_event("speak", chars=len(result), phrase=True)
+                speech.speculate(ui.text_buffer)
+
+            # Scale the camera frame once into the screen buffer and draw the
+            # UI on top at display resolution
+            with metrics.span("resize"):
+                frame = display.compose(camera_frame)
+            with metrics.span("draw_ui"):
+                frame = ui.draw_ui(frame)
+            if show_overlay:
+                metrics.draw_overlay(frame)
+
+            with metrics.span("imshow"):
+                cv2.imshow("EyeSpeak Interface", frame)
+            if startup is not None:
+                startup.mark("first_frame")
+                startup.report()
+                startup.shutdown()
+                startup = None
+
+            fps_frames += 1
+            fps_elapsed = time.perf_counter() - fps_started_at
+            if fps_elapsed >= 10:
+                print(f"[INFO] FPS: {fps_frames / fps_elapsed:.1f}, face mesh {tracker.avg_inference_ms:.1f} ms/frame")
+                if camera.threaded:
+                    print(f"[INFO] Camera: {camera.capture_fps:.1f} FPS captured, {camera.dropped_frames} frames dropped")
+                print(f"[INFO] Detection: {tracker.detection_stats()}")
+                print(f"[INFO] Stage p50/p99 ms: {metrics.summary_line()}")
+                print(f"[INFO] Scheduler lateness p50/p99 ms: {scheduler.summary_line()}")
+                print(frame_pool.summary_line())
+                speech_latency = speech.latency_summary()
+                if speech_latency:
+                    parts = [f"{label} p50/p99 ms {stats['p50_ms']}/{stats['p99_ms']} over {stats['count']}"
+                             for label, stats in (("first audio (pre-rendered)", speech_latency["first_audio"]),
+                                                  ("synthesis start", speech_latency["synthesis_start"]))
+                             if stats]
+                    print(f"[INFO] Speech: {', '.join(parts)}; {speech_latency['restarts']} synthesizer restarts, "
+                          f"{speech_latency['speculative_hits']} played pre-rendered")
+                fps_started_at = time.perf_counter()
+                fps_frames = 0
+            metrics.maybe_export()
+
+            with metrics.span("events"):
+                key = cv2.waitKey(1) & 0xFF
+            metrics.record("loop", time.perf_counter() - loop_started)
+            if key == 27:  # ESC to exit
                 break
             if cv2.getWindowProperty("EyeSpeak Interface", cv2.WND_PROP_VISIBLE) < 1:
                 break
     finally:
+        speech.stop()
+        if ui.events is not None:
+            ui.events.stop()
         camera.stop()
         tracker.release()
         cv2.destroyAllWindows()
@@ -0,0 +1,260 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/blink_calibration.py
+#
+# Per-user blink calibration for the EAR blink engine.
+#   python -m modules.blink_calibration run --user NAME     record, fit and save
+#   python -m modules.blink_calibration record --user NAME  guided session only
+#   python -m modules.blink_calibration fit SESSION.npz [--workers 4] [--save]
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from modules.settings import load_settings, save_settings
+
+SESSIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "recordings", "calibration")
+
+# Search grid; open_threshold keeps the configured gap above close_threshold
+CLOSE_THRESHOLDS = np.round(np.arange(0.10, 0.305, 0.01), 3)
+MIN_DURATIONS = np.round(np.arange(0.0, 0.205, 0.02), 3)
+COOLDOWNS = np.round(np.arange(0.1, 1.05, 0.1), 3)
+
+# A blink counts for a cue if it ends within this many seconds after it
+RESPONSE_WINDOW = (0.0, 2.0)
+
+
+# ── Guided session ───────────────────────────────────────────────────────────
+
+def record_session(user, cues=12, settle=3.0, gap=(3.0, 5.0), seed=None):
+    # Shows "BLINK" cues at random intervals and records the smoothed EAR of
+    # every frame; no face is stored as NaN
+    from modules.camera import camera_from_settings
+    from modules.eye_tracker import EyeTracker
+
+    settings = load_settings()
+    camera = camera_from_settings(settings.get("camera", {}))
+    tracker = EyeTracker(camera, blink_engine="ear", blink_settings=settings.get("blink"))
+
+    rng = np.random.default_rng(seed)
+    start = time.monotonic()
+    cue_times = start + settle + np.cumsum(rng.uniform(*gap, size=cues))
+    end = cue_times[-1] + gap[1]
+
+    stamps, ears = [], []
+    window_name = "EyeSpeak Calibration"
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    try:
+        while time.monotonic() < end:
+            # A threaded camera hands out its latest frame again until the next
+            # one arrives; record every frame once
+            if not camera.wait_for_frame(timeout=0.5):
+                continue
+            frame, stamp = camera.get_latest()
+            if frame is None:
+                continue
+            result = tracker.process(frame, timestamp=stamp)
+            stamps.append(stamp)
+            ears.append(np.nan if result.ear is None else result.ear)
+
+            now = time.monotonic()
+            since_cue = now - cue_times[cue_times <= now].max(initial=-np.inf)
+            screen = np.zeros((300, 800, 3), dtype=np.uint8)
+            if since_cue < 1.0:
+                cv2.circle(screen, (400, 130), 70, (0, 255, 0), -1)
+                cv2.putText(screen, "BLINK", (345, 270), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (0, 255, 0), 3)
+            else:
+                cv2.putText(screen, "Keep your eyes open and look here", (120, 150),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            done = int((cue_times <= now).sum())
+            cv2.putText(screen, f"{user}  {done}/{cues}", (20, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (150, 150, 150), 1)
+            cv2.imshow(window_name, screen)
+            if cv2.waitKey(1) & 0xFF == 27:
+                print("[INFO] Calibration cancelled.")
+                return None
+    finally:
+        cv2.destroyWindow(window_name)
+        camera.stop()
+        tracker.release()
+
+    os.makedirs(SESSIONS_DIR, exist_ok=True)
+    path = os.path.join(SESSIONS_DIR, f"{user}-{time.strftime('%Y%m%d-%H%M%S')}.npz")
+    blink = settings.get("blink", {})
+    np.savez_compressed(path, stamps=np.array(stamps) - start, ears=np.array(ears), cues=cue_times - start,
+                        user=user, open_gap=blink.get("open_threshold", 0.24) - blink.get("close_threshold", 0.20),
+                        max_duration=blink.get("max_duration", 1.5))
+    print(f"[INFO] Recorded {len(stamps)} frames and {cues} cues to {path}")
+    return path
+
+
+def load_session(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+# ── Grid search ──────────────────────────────────────────────────────────────
+
+def simulate(stamps, ears, close, open_, min_duration, max_duration, cooldown):
+    # BlinkDetector's state machine run for G parameter sets at once over the
+    # recorded (already smoothed) EAR series. Parameters are (G,) arrays;
+    # returns a (G, N) mask of the frames where a blink fires.
+    g, n = len(close), len(stamps)
+    closed_since = np.full(g, np.nan)
+    last_blink = np.full(g, -np.inf)
+    fired = np.zeros((g, n), dtype=bool)
+    for j in range(n):
+        ear, t = ears[j], stamps[j]
+        if np.isnan(ear):
+            # Face lost
+            closed_since[:] = np.nan
+            continue
+        is_closed = ~np.isnan(closed_since)
+        reopened = is_closed & (ear > open_)
+        duration = t - closed_since
+        hit = (reopened & (duration >= min_duration) & (duration <= max_duration)
+               & (t - last_blink >= cooldown))
+        fired[:, j] = hit
+        last_blink[hit] = t
+        closed_since[reopened] = np.nan
+        closed_since[~is_closed & (ear < close)] = t
+    return fired
+
+
+def score(fired, stamps, cues, window=RESPONSE_WINDOW):
+    # Each cue is hit by the first blink in its window; every other blink is
+    # a false trigger. Returns (f1, hits, false_triggers, misses) per row.
+    offsets = stamps[None, :] - cues[:, None]
+    in_window = (offsets >= window[0]) & (offsets <= window[1])  # (cues, N)
+    per_cue = fired.astype(np.int32) @ in_window.T.astype(np.int32)  # (G, cues)
+    hits = (per_cue > 0).sum(axis=1)
+    false_triggers = fired.sum(axis=1) - hits
+    misses = len(cues) - hits
+    f1 = 2 * hits / np.maximum(2 * hits + false_triggers + misses, 1)
+    return f1, hits, false_triggers, misses
+
+
+def _search_chunk(args):
+    stamps, ears, cues, close_values, open_gap, max_duration = args
+    close, min_d, cool = np.meshgrid(close_values, MIN_DURATIONS, COOLDOWNS, indexing="ij")
+    close, min_d, cool = close.ravel(), min_d.ravel(), cool.ravel()
+    fired = simulate(stamps, ears, close, close + open_gap, min_d, max_duration, cool)
+    return score(fired, stamps, cues)
+
+
+def grid_search(session, workers=1):
+    stamps, ears, cues = session["stamps"], session["ears"], session["cues"]
+    open_gap, max_duration = float(session["open_gap"]), float(session["max_duration"])
+    chunks = [(stamps, ears, cues, part, open_gap, max_duration)
+              for part in np.array_split(CLOSE_THRESHOLDS, max(1, workers))]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_search_chunk, chunks))
+    else:
+        results = [_search_chunk(chunk) for chunk in chunks]
+
+    shape = (len(CLOSE_THRESHOLDS), len(MIN_DURATIONS), len(COOLDOWNS))
+    f1, hits, false_triggers, misses = (np.concatenate(parts).reshape(shape) for parts in zip(*results))
+
+    # Among equally good settings prefer the one whose neighbours score best,
+    # so a small drift in the user's EAR doesn't fall off a cliff (the grid
+    # edge counts as zero), then the shorter cooldown
+    padded = np.pad(f1, 1)
+    neighbourhood = sum(padded[i:i + shape[0], j:j + shape[1], k:k + shape[2]]
+                        for i in range(3) for j in range(3) for k in range(3)) / 27
+    cooldown = np.broadcast_to(COOLDOWNS, shape)
+    best = np.unravel_index(np.lexsort((-cooldown.ravel(), neighbourhood.ravel(), f1.ravel()))[-1], shape)
+
+    close = float(CLOSE_THRESHOLDS[best[0]])
+    return {
+        "close_threshold": close,
+        "open_threshold": round(close + open_gap, 3),
+        "min_duration": float(MIN_DURATIONS[best[1]]),
+        "cooldown": float(COOLDOWNS[best[2]]),
+        "f1": float(f1[best]),
+        "hits": int(hits[best]),
+        "false_triggers": int(false_triggers[best]),
+        "misses": int(misses[best]),
+    }
+
+
+def evaluate(session, blink_settings):
+    blink = {"close_threshold": 0.20, "open_threshold": 0.24, "min_duration": 0.08,
+             "max_duration": 1.5, "cooldown": 0.25, **(blink_settings or {})}
+    fired = simulate(session["stamps"], session["ears"], *(np.array([blink[key]]) for key in
+                     ("close_threshold", "open_threshold", "min_duration", "max_duration", "cooldown")))
+    f1, hits, false_triggers, misses = score(fired, session["stamps"], session["cues"])
+    return {"f1": float(f1[0]), "hits": int(hits[0]), "false_triggers": int(false_triggers[0]),
+            "misses": int(misses[0])}
+
+
+def save_profile(profile, user, session_path):
+    settings = load_settings()
+    blink = settings.setdefault("blink", {})
+    for key in ("close_threshold", "open_threshold", "min_duration", "cooldown"):
+        blink[key] = profile[key]
+    settings["blink_calibration"] = {
+        "user": user,
+        "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "session": os.path.relpath(session_path, os.path.join(SESSIONS_DIR, "..", "..")),
+        "f1": round(profile["f1"], 3),
+    }
+    save_settings(settings)
+    print("[INFO] Blink profile saved to config/settings.yaml")
+
+
+def fit(path, workers=1, save=False):
+    session = load_session(path)
+    started = time.perf_counter()
+    profile = grid_search(session, workers)
+    elapsed = time.perf_counter() - started
+    current = evaluate(session, load_settings().get("blink"))
+    grid_size = len(CLOSE_THRESHOLDS) * len(MIN_DURATIONS) * len(COOLDOWNS)
+    print(f"[INFO] Searched {grid_size} settings over {len(session['stamps'])} frames in {elapsed:.2f}s")
+    print(f"[INFO] Current: F1 {current['f1']:.2f} ({current['hits']} hits, "
+          f"{current['false_triggers']} false, {current['misses']} missed)")
+    print(f"[INFO] Best:    F1 {profile['f1']:.2f} ({profile['hits']} hits, "
+          f"{profile['false_triggers']} false, {profile['misses']} missed) with close {profile['close_threshold']}, "
+          f"open {profile['open_threshold']}, min {profile['min_duration']}s, cooldown {profile['cooldown']}s")
+    if save:
+        save_profile(profile, str(session["user"]), path)
+    return profile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate blink detection for one user")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, text in (("run", "record a guided session, fit and save"), ("record", "record a guided session")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("--user", required=True)
+        p.add_argument("--cues", type=int, default=12)
+        p.add_argument("--workers", type=int, default=1)
+    p = sub.add_parser("fit", help="grid-search a recorded session")
+    p.add_argument("path")
+    p.add_argument("--workers", type=int, default=1)
+    p.add_argument("--save", action="store_true", help="write the best profile to config/settings.yaml")
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        fit(args.path, args.workers, args.save)
+    else:
+        session_path = record_session(args.user, cues=args.cues)
+        if session_path and args.command == "run":
+            fit(session_path, args.workers, save=True)
@@ -0,0 +1,94 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/blink_detector.py
+import numpy as np
+
+# MediaPipe face mesh eye contours as p1..p6 for the eye aspect ratio:
+# p1/p4 are the corners, p2/p6 and p3/p5 the upper/lower lid pairs
+LEFT_EYE = [33, 160, 158, 133, 153, 144]
+RIGHT_EYE = [362, 385, 387, 263, 373, 380]
+EYE_LANDMARKS = np.array([LEFT_EYE, RIGHT_EYE])
+
+
+def eye_aspect_ratio(points):
+    # points: (..., 2 eyes, 6 points, xy) in pixels -> (..., 2) EAR per eye
+    vertical = (np.linalg.norm(points[..., 1, :] - points[..., 5, :], axis=-1)
+                + np.linalg.norm(points[..., 2, :] - points[..., 4, :], axis=-1))
+    horizontal = np.linalg.norm(points[..., 0, :] - points[..., 3, :], axis=-1)
+    return vertical / np.maximum(2.0 * horizontal, 1e-6)
+
+
+class BlinkDetector:
+    def __init__(self, close_threshold=0.20, open_threshold=0.24, min_duration=0.08,
+                 max_duration=1.5, cooldown=0.25, smoothing=2, combine="min", history=64):
+        self.close_threshold = close_threshold
+        self.open_threshold = max(open_threshold, close_threshold)
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.cooldown = cooldown
+        self.smoothing = max(1, smoothing)
+        # "min" fires when either eye closes (like the old lid-gap check),
+        # "mean" needs both eyes
+        self.combine = combine
+
+        # Ring buffer of recent combined EAR values for smoothing
+        self.ears = np.zeros(history)
+        self.count = 0
+
+        self.ear = None
+        self.closed_since = None
+        self.last_blink = -np.inf
+        self.last_duration = 0.0
+
+    def reset(self):
+        # Face lost: whatever closure was in progress can't be judged
+        self.closed_since = None
+
+    def update(self, eye_points, stamp):
+        ear_pair = eye_aspect_ratio(eye_points)
+        ear = ear_pair.min() if self.combine == "min" else ear_pair.mean()
+
+        slot = self.count % len(self.ears)
+        self.ears[slot] = ear
+        self.count += 1
+
+        # Mean of the newest samples suppresses single-frame landmark jitter
+        n = min(self.smoothing, self.count)
+        recent = (np.arange(self.count - n, self.count)) % len(self.ears)
+        self.ear = float(self.ears[recent].mean())
+
+        if self.closed_since is None:
+            if self.ear < self.close_threshold:
+                self.closed_since = stamp
+            return False
+
+        if self.ear <= self.open_threshold:
+            return False
+
+        # Reopened: a blink is a closure of plausible length outside the cooldown
+        duration = stamp - self.closed_since
+        self.closed_since = None
+        self.last_duration = duration
+        if not self.min_duration <= duration <= self.max_duration:
+            return False
+        if stamp - self.last_blink < self.cooldown:
+            return False
+        self.last_blink = stamp
+        return True
@@ -22,11 +22,156 @@ try:
 except ImportError:
     Picamera2 = None  # Not available on Windows
 
+import sys
+import threading
+import time
 import cv2
+import numpy as np
+from modules.settings import load_settings, save_settings
+
+# V4L2 on Linux, DirectShow on Windows; OpenCV's own pick elsewhere
+if sys.platform.startswith("linux"):
+    DEFAULT_BACKEND = cv2.CAP_V4L2
+elif sys.platform == "win32":
+    DEFAULT_BACKEND = cv2.CAP_DSHOW
+else:
+    DEFAULT_BACKEND = cv2.CAP_ANY
+
+# Preferred pixel formats: MJPG reaches full frame rate over USB 2 at 640x480
+# and above, YUYV needs no decoding; None keeps the driver's default
+FOURCCS = ("MJPG", "YUYV")
+
+
+def fourcc_name(value):
+    value = int(value)
+    return "".join(chr((value >> 8 * i) & 0xFF) for i in range(4)).strip("\0 ")
+
+
+def open_capture(device=0, width=640, height=480, fps=30, fourccs=FOURCCS, driver_buffers=1, backend=None):
+    # Opens device with the first format in fourccs that the driver accepts
+    # and delivers a frame in. Returns (cap, mode) with the negotiated mode,
+    # or (None, None) when the device cannot be opened at all
+    backend = DEFAULT_BACKEND if backend is None else backend
+    for fourcc in list(fourccs) + [None]:
+        cap = cv2.VideoCapture(device, backend)
+        if not cap.isOpened():
+            cap.release()
+            return None, None
+        # Format first: V4L2 drivers reset size and rate when it changes
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_FPS, fps)
+        # With a single driver buffer read() returns the newest frame instead
+        # of one that queued up while we were busy
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, driver_buffers)
+
+        ok, frame = cap.read()
+        actual = fourcc_name(cap.get(cv2.CAP_PROP_FOURCC))
+        # Some backends do not report the format; trust the frame then
+        if ok and frame is not None and (fourcc is None or actual in (fourcc, "")):
+            mode = {
+                "device": device,
+                "backend": cap.getBackendName(),
+                "fourcc": actual or fourcc,
+                "width": frame.shape[1],
+                "height": frame.shape[0],
+                "fps": round(cap.get(cv2.CAP_PROP_FPS), 1),
+            }
+            return cap, mode
+        cap.release()
+    return None, None
+
+
+def probe_devices(devices=range(4), width=640, height=480, fps=30, fourccs=FOURCCS, frames=15):
+    # Headless probe: opens each device, negotiates a mode and times a few
+    # reads. Returns the working modes with a measured_fps entry each
+    modes = []
+    for device in devices:
+        cap, mode = open_capture(device, width, height, fps, fourccs)
+        if cap is None:
+            print(f"[INFO] Camera {device}: not available")
+            continue
+        started = time.monotonic()
+        read = 0
+        for _ in range(frames):
+            ok, _ = cap.read()
+            read += ok
+        elapsed = time.monotonic() - started
+        cap.release()
+        if read == 0:
+            print(f"[INFO] Camera {device}: opened but delivered no frames")
+            continue
+        mode["measured_fps"] = round(read / elapsed, 1) if elapsed > 0 else 0.0
+        print(f"[INFO] Camera {device}: {mode['fourcc']} {mode['width']}x{mode['height']} "
+              f"@ {mode['measured_fps']} FPS via {mode['backend']}")
+        modes.append(mode)
+    return modes
+
+
+def requested_mode(camera_settings):
+    return {
+        "width": camera_settings.get("width", 640),
+        "height": camera_settings.get("height", 480),
+        "fps": camera_settings.get("fps", 30),
+    }
+
+
+def cached_mode(camera_settings):
+    # The probed mode from config when it was probed for the current request
+    # (and device, if one is pinned); None means probe again
+    probed = camera_settings.get("probed")
+    if not probed or probed.get("requested") != requested_mode(camera_settings):
+        return None
+    device = camera_settings.get("device", "auto")
+    if device != "auto" and probed.get("device") != device:
+        return None
+    return probed
+
+
+def find_camera_mode(camera_settings):
+    # Cached mode if there is one, otherwise probe and cache the first
+    # working device so later startups skip probing
+    mode = cached_mode(camera_settings)
+    if mode is not None:
+        return mode
+    device = camera_settings.get("device", "auto")
+    devices = range(camera_settings.get("probe_devices", 4)) if device == "auto" else [device]
+    requested = requested_mode(camera_settings)
+    modes = probe_devices(devices, requested["width"], requested["height"], requested["fps"],
+                          camera_settings.get("fourcc", FOURCCS))
+    if not modes:
+        return None
+    mode = dict(modes[0], requested=requested)
+    save_probed_mode(mode)
+    camera_settings["probed"] = mode
+    return mode
+
+
+def save_probed_mode(mode):
+    settings = load_settings()
+    settings.setdefault("camera", {})["probed"] = mode
+    save_settings(settings)
+    print(f"[INFO] Camera mode cached in config/settings.yaml (device {mode['device']}, {mode['fourcc']})")
+
+
+def forget_probed_mode(camera_settings):
+    camera_settings.pop("probed", None)
+    settings = load_settings()
+    if settings.get("camera", {}).pop("probed", None) is not None:
+        save_settings(settings)
+
 
 class Camera:
-    def __init__(self, width=640, height=480):
+    def __init__(self, width=640, height=480, threaded=False, buffer_size=3,
+                 device=0, fps=30, fourccs=FOURCCS, driver_buffers=1):
         self.using_picamera2 = False
+        self.threaded = threaded
+        self.dropped_frames = 0
+        self.capture_fps = 0.0
+        self.frames_captured = 0
+        self.mode = None
 
         if Picamera2 is not None:
             try:
@@ -44,29 +189,159 @@ class Camera:
 
         if not self.using_picamera2:
             print("[INFO] Initializing OpenCV fallback camera")
-            self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            # open_capture already read one frame, so no warm-up reads
+            self.cap, self.mode = open_capture(device, width, height, fps, fourccs, driver_buffers)
+            if self.cap is None:
+                raise RuntimeError(f"camera {device} could not be opened")
+            print(f"[INFO] Camera {device}: {self.mode['fourcc']} {self.mode['width']}x{self.mode['height']} "
+                  f"@ {self.mode['fps']} FPS via {self.mode['backend']}")
 
-            for _ in range(5):
-                self.cap.read()
+        if threaded:
+            self.start_capture_thread(buffer_size)
 
-    def get_frame(self):
+    def read_sensor(self, out=None):
         if self.using_picamera2:
-            return self.picam2.capture_array()
+            frame = self.picam2.capture_array()
         else:
-            ret, frame = self.cap.read()
+            ret, frame = self.cap.read(out)
             if not ret:
                 print("[ERROR] Failed to capture frame from fallback camera")
                 return None
+        if out is not None and frame is not out:
+            if frame.shape != out.shape:
+                return frame
+            np.copyto(out, frame)
+            return out
+        return frame
+
+    def get_frame(self):
+        if self.threaded:
+            frame, _ = self.get_latest()
             return frame
+        return self.read_sensor()
 
-    def stop(self):
+    # ── Background capture ───────────────────────────────────────────────────
+
+    def start_capture_thread(self, buffer_size=3, first_frame_timeout=2.0):
+        # At least two slots so the capture thread never writes the slot
+        # a consumer is about to copy
+        self.buffer_size = max(2, buffer_size)
+        self.ring = None
+        self.ring_stamps = [0.0] * self.buffer_size
+        self.write_seq = 0
+        self.read_seq = -1
+        self.ring_lock = threading.Lock()
+        self.frame_ready = threading.Condition(self.ring_lock)
+        self.capturing = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+
+        deadline = time.monotonic() + first_frame_timeout
+        while self.write_seq == 0 and self.capturing and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _capture_loop(self):
+        last_stamp = None
+        while self.capturing:
+            slot = self.write_seq % self.buffer_size
+            out = self.ring[slot] if self.ring is not None else None
+            try:
+                frame = self.read_sensor(out)
+            except Exception as e:
+                print(f"[ERROR] Capture thread failed to read frame: {e}")
+                frame = None
+            if frame is None:
+                time.sleep(0.005)
+                continue
+            stamp = time.monotonic()
+
+            if frame is not out:
+                # First frame, or the sensor changed resolution: (re)allocate the ring
+                ring = np.empty((self.buffer_size,) + frame.shape, dtype=frame.dtype)
+                np.copyto(ring[slot], frame)
+                with self.ring_lock:
+                    self.ring = ring
+
+            with self.ring_lock:
+                self.ring_stamps[slot] = stamp
+                self.write_seq += 1
+                self.frame_ready.notify_all()
+            self.frames_captured += 1
+
+            if last_stamp is not None and stamp > last_stamp:
+                fps = 1.0 / (stamp - last_stamp)
+                self.capture_fps = fps if self.capture_fps == 0 else 0.9 * self.capture_fps + 0.1 * fps
+            last_stamp = stamp
+
+    def get_latest(self, out=None):
+        # Returns a copy of the newest frame and its time.monotonic() capture
+        # stamp without waiting on the sensor; (None, None) before the first frame
+        if not self.threaded:
+            frame = self.read_sensor(out)
+            return frame, time.monotonic() if frame is not None else None
+        with self.ring_lock:
+            if self.write_seq == 0:
+                return None, None
+            latest = self.write_seq - 1
+            if latest > self.read_seq:
+                self.dropped_frames += latest - self.read_seq - 1
+            self.read_seq = latest
+            slot = latest % self.buffer_size
+            if out is None or out.shape != self.ring[slot].shape:
+                out = self.ring[slot].copy()
+            else:
+                np.copyto(out, self.ring[slot])
+            return out, self.ring_stamps[slot]
+
+    def wait_for_frame(self, timeout=None):
+        # Blocks until there is a frame newer than the last one handed out by
+        # get_latest, or timeout seconds pass; True if one is ready
+        if not self.threaded:
+            # get_latest waits on the sensor itself
+            return True
+        with self.frame_ready:
+            return self.frame_ready.wait_for(lambda: self.write_seq - 1 > self.read_seq, timeout)
+
+    def stop_capture_thread(self):
+        if self.threaded and self.capture_thread.is_alive():
+            self.capturing = False
+            self.capture_thread.join(timeout=1.0)
+
+    def close(self):
+        # Frees the device without touching any windows, so it is safe from
+        # the startup thread while the splash screen is up
+        self.stop_capture_thread()
         if self.using_picamera2:
             self.picam2.stop()
         else:
             self.cap.release()
+
+    def stop(self):
+        self.close()
         cv2.destroyAllWindows()
 
     def release(self):
         self.stop()
+
+
+def camera_from_settings(camera_settings):
+    # The camera described by the camera section of settings.yaml. The Pi
+    # camera needs no probing; OpenCV devices use the cached (or freshly
+    # probed) device and pixel format
+    mode = None if Picamera2 is not None else find_camera_mode(camera_settings)
+    try:
+        return Camera(
+            width=camera_settings.get("width", 640),
+            height=camera_settings.get("height", 480),
+            threaded=camera_settings.get("threaded", False),
+            buffer_size=camera_settings.get("buffer_size", 3),
+            device=mode["device"] if mode else 0,
+            fps=camera_settings.get("fps", 30),
+            fourccs=[mode["fourcc"]] if mode else camera_settings.get("fourcc", FOURCCS),
+            driver_buffers=camera_settings.get("driver_buffers", 1),
+        )
+    except Exception:
+        if mode is not None:
+            # The cached device may have been unplugged or renumbered
+            forget_probed_mode(camera_settings)
+        raise
@@ -0,0 +1,321 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/camera_replay.py
+import argparse
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import zipfile
+import numpy as np
+
+# Recording layout (one directory per session):
+#   meta.json          frame shape, dtype, frame count, chunk size
+#   timestamps.npy     float64 capture time of each frame, seconds from the first
+#   frames_00000.npz   zlib-compressed chunk, one member per frame ("f000", ...)
+#                      so replay decompresses a single frame at a time
+#   frames_00000.npy   uncompressed (chunk_size, h, w, 3) stack of raw BGR
+#                      frames, memory-mapped on replay (compress=False)
+# Either way frames are stored losslessly, so replays are bit-exact.
+
+
+class FrameRecorder:
+    # write() only copies the frame into a chunk buffer; full chunks are
+    # saved by a writer thread. Buffers are recycled, and if the disk falls
+    # behind by more than max_pending chunks, frames are dropped (and
+    # counted) rather than stalling the caller. All buffers together stay
+    # within max_buffer_mb: chunk_size shrinks to fit on the first frame
+    def __init__(self, path, chunk_size=150, compress=True, max_pending=2, max_buffer_mb=64):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.max_buffer_bytes = max_buffer_mb * 2 ** 20
+        self.compress = compress
+        self.max_buffers = max_pending + 1
+        self.buffers = 0
+        self.free = queue.Queue()
+        self.pending = queue.Queue()
+        self.chunk = None
+        self.chunk_fill = 0
+        self.chunk_count = 0
+        self.shape = None
+        self.dtype = None
+        self.timestamps = []
+        self.started_at = None
+        self.dropped_frames = 0
+        os.makedirs(path, exist_ok=True)
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def write(self, frame, stamp=None):
+        if stamp is None:
+            stamp = time.monotonic()
+        if self.started_at is None:
+            self.started_at = stamp
+        if self.shape is None:
+            self.shape, self.dtype = frame.shape, frame.dtype
+            fit = self.max_buffer_bytes // (self.max_buffers * frame.nbytes)
+            self.chunk_size = max(1, min(self.chunk_size, fit))
+        elif frame.shape != self.shape:
+            raise ValueError(f"Frame shape changed from {self.shape} to {frame.shape}")
+
+        if self.chunk is None:
+            self.chunk = self._take_buffer()
+            if self.chunk is None:
+                self.dropped_frames += 1
+                return
+
+        np.copyto(self.chunk[self.chunk_fill], frame)
+        self.chunk_fill += 1
+        self.timestamps.append(stamp - self.started_at)
+        if self.chunk_fill == self.chunk_size:
+            self._flush()
+
+    def _take_buffer(self):
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            pass
+        if self.buffers >= self.max_buffers:
+            return None
+        self.buffers += 1
+        return np.empty((self.chunk_size,) + self.shape, dtype=self.dtype)
+
+    def _flush(self):
+        if self.chunk_fill == 0:
+            return
+        self.pending.put((self.chunk_count, self.chunk, self.chunk_fill))
+        self.chunk_count += 1
+        self.chunk = None
+        self.chunk_fill = 0
+
+    def _write_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            index, chunk, fill = item
+            name = os.path.join(self.path, f"frames_{index:05d}")
+            try:
+                if self.compress:
+                    self._save_compressed(name + ".npz", chunk, fill)
+                else:
+                    np.save(name + ".npy", chunk[:fill])
+            except OSError as e:
+                print(f"[ERROR] Could not write {name}: {e}")
+            self.free.put(chunk)
+
+    @staticmethod
+    def _save_compressed(path, chunk, fill):
+        # Same layout as np.savez_compressed, at the fastest zlib level so
+        # the writer keeps up with the camera on small boards
+        tmp_path = path + ".tmp"
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for i in range(fill):
+                with zf.open(f"f{i:03d}.npy", "w", force_zip64=True) as f:
+                    np.lib.format.write_array(f, chunk[i])
+        os.replace(tmp_path, path)
+
+    def close(self):
+        self._flush()
+        self.pending.put(None)
+        self.writer.join()
+        np.save(os.path.join(self.path, "timestamps.npy"), np.array(self.timestamps, dtype=np.float64))
+        meta = {
+            "frames": len(self.timestamps),
+            "chunk_size": self.chunk_size,
+            "shape": list(self.shape) if self.shape is not None else None,
+            "dtype": str(self.dtype) if self.dtype is not None else None,
+            "compressed": self.compress,
+            "dropped_frames": self.dropped_frames,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+        dropped = f", {self.dropped_frames} dropped while the disk caught up" if self.dropped_frames else ""
+        print(f"[INFO] Recorded {meta['frames']} frames to {self.path}{dropped}")
+
+
+class RecordingCamera:
+    # Wraps a live Camera and records every frame handed out
+    def __init__(self, camera, path, chunk_size=30):
+        self.camera = camera
+        self.recorder = FrameRecorder(path, chunk_size)
+
+    def __getattr__(self, name):
+        return getattr(self.camera, name)
+
+    def get_latest(self, out=None):
+        frame, stamp = self.camera.get_latest(out)
+        if frame is not None:
+            self.recorder.write(frame, stamp)
+        return frame, stamp
+
+    def get_frame(self):
+        frame, _ = self.get_latest()
+        return frame
+
+    def stop(self):
+        self.recorder.close()
+        self.camera.stop()
+
+    def release(self):
+        self.stop()
+
+
+class ReplayCamera:
+    # Drop-in for Camera that plays back a FrameRecorder session.
+    # realtime=True paces frames by their recorded timestamps and, like a live
+    # sensor, skips frames the consumer was too slow for; stamps are then on
+    # the time.monotonic() clock. realtime=False hands out every frame as fast
+    # as it is asked for, stamped with its recorded time.
+    def __init__(self, path, realtime=True, loop=False):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.timestamps = np.load(os.path.join(path, "timestamps.npy"))
+        # Compressed chunks are opened lazily and read one frame member at a time
+        self.chunks = [np.load(name, mmap_mode="r") if name.endswith(".npy") else np.load(name)
+                       for name in sorted(glob.glob(os.path.join(path, "frames_*.np[yz]")))]
+        self.chunk_size = self.meta["chunk_size"]
+        self.frame_count = len(self.timestamps)
+        self.realtime = realtime
+        self.loop = loop
+        self.threaded = False
+        self.index = 0
+        self.started_at = None
+        self.last_stamp = None
+        self.dropped_frames = 0
+        self.capture_fps = 0.0
+        print(f"[INFO] Replaying {self.frame_count} frames from {path} ({'real-time' if realtime else 'fast'})")
+
+    def _frame(self, i):
+        # A view into the memory-mapped chunk (copy before keeping it), or a
+        # freshly decompressed frame
+        chunk = self.chunks[i // self.chunk_size]
+        if isinstance(chunk, np.lib.npyio.NpzFile):
+            return chunk[f"f{i % self.chunk_size:03d}"]
+        return chunk[i % self.chunk_size]
+
+    def rewind(self):
+        self.index = 0
+        self.started_at = None
+
+    def get_latest(self, out=None):
+        if self.index >= self.frame_count:
+            if not self.loop or self.frame_count == 0:
+                return None, None
+            self.rewind()
+
+        if self.realtime:
+            now = time.monotonic()
+            if self.started_at is None:
+                self.started_at = now - self.timestamps[self.index]
+            due = self.started_at + self.timestamps[self.index]
+            if due > now:
+                time.sleep(due - now)
+                now = due
+            # Newest frame whose timestamp has passed
+            latest = int(np.searchsorted(self.timestamps, now - self.started_at, side="right")) - 1
+            latest = min(max(latest, self.index), self.frame_count - 1)
+            self.dropped_frames += latest - self.index
+            self.index = latest
+
+        stored = self._frame(self.index)
+        if out is not None and out.shape == stored.shape:
+            # Straight from the memory map into the caller's buffer
+            np.copyto(out, stored)
+            frame = out
+        else:
+            frame = np.array(stored)
+        self.last_stamp = float(self.timestamps[self.index])
+        if self.realtime:
+            self.last_stamp += self.started_at
+        self.index += 1
+        return frame, self.last_stamp
+
+    def get_frame(self):
+        frame, _ = self.get_latest()
+        return frame
+
+    def wait_for_frame(self, timeout=None):
+        # Same contract as Camera.wait_for_frame
+        if not self.realtime or self.started_at is None or self.index >= self.frame_count:
+            return True
+        delay = self.started_at + self.timestamps[self.index] - time.monotonic()
+        if timeout is not None and delay > timeout:
+            time.sleep(max(0.0, timeout))
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    def stop(self):
+        for chunk in self.chunks:
+            if isinstance(chunk, np.lib.npyio.NpzFile):
+                chunk.close()
+        self.chunks = []
+
+    def release(self):
+        self.stop()
+
+
+def record(path, seconds, chunk_size, compress=True):
+    from modules.camera import camera_from_settings
+    from modules.settings import load_settings
+
+    # Unthreaded so every frame is read once, never handed out twice
+    camera = camera_from_settings(dict(load_settings().get("camera", {}), threaded=False))
+    recorder = FrameRecorder(path, chunk_size, compress)
+    end = time.monotonic() + seconds
+    try:
+        while time.monotonic() < end:
+            frame = camera.get_frame()
+            if frame is not None:
+                recorder.write(frame)
+    finally:
+        recorder.close()
+        camera.stop()
+
+
+def info(path):
+    replay = ReplayCamera(path, realtime=False)
+    stamps = replay.timestamps
+    duration = stamps[-1] if len(stamps) else 0.0
+    fps = (len(stamps) - 1) / duration if duration > 0 else 0.0
+    print(f"[INFO] {replay.frame_count} frames, shape {replay.meta['shape']}, {duration:.1f}s, {fps:.1f} FPS")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or inspect camera sessions for offline replay")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record frames from the live camera")
+    rec.add_argument("path")
+    rec.add_argument("--seconds", type=float, default=30)
+    rec.add_argument("--chunk-size", type=int, default=150,
+                     help="frames per chunk at most; chunks shrink so the buffers stay within 64 MB")
+    rec.add_argument("--raw", action="store_true", help="store uncompressed, memory-mappable chunks")
+    inf = sub.add_parser("info", help="summarize a recording")
+    inf.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.path, args.seconds, args.chunk_size, not args.raw)
+    else:
+        info(args.path)
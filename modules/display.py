@@ -0,0 +1,59 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/display.py
+import cv2
+import numpy as np
+
+INTERPOLATION = {
+    "nearest": cv2.INTER_NEAREST,
+    "linear": cv2.INTER_LINEAR,
+    "area": cv2.INTER_AREA,
+    "cubic": cv2.INTER_CUBIC,
+}
+
+
+class DisplayPipeline:
+    # Scales the camera frame once, straight into a screen-sized buffer that
+    # is reused every frame. The UI is then drawn on that buffer at display
+    # resolution, so nothing is resized after drawing.
+    def __init__(self, screen_w, screen_h, interpolation="linear", preview_scale=1.0):
+        if interpolation not in INTERPOLATION:
+            raise ValueError(f"Unknown interpolation {interpolation!r}, expected one of {sorted(INTERPOLATION)}")
+        self.screen_w = screen_w
+        self.screen_h = screen_h
+        self.interpolation = INTERPOLATION[interpolation]
+        self.canvas = np.zeros((screen_h, screen_w, 3), dtype=np.uint8)
+
+        # The resize cost grows with the destination size; a smaller preview
+        # sits centered in the canvas and the border around it is cleared
+        preview_scale = min(max(preview_scale, 0.1), 1.0)
+        pw, ph = int(screen_w * preview_scale), int(screen_h * preview_scale)
+        x, y = (screen_w - pw) // 2, (screen_h - ph) // 2
+        self.preview_rect = (x, y, pw, ph)
+        self.preview = self.canvas[y:y + ph, x:x + pw]
+        self.full_preview = (pw, ph) == (screen_w, screen_h)
+
+    def compose(self, frame):
+        if not self.full_preview:
+            # The UI drew over the border on the previous frame
+            self.canvas[:] = 0
+        x, y, pw, ph = self.preview_rect
+        cv2.resize(frame, (pw, ph), dst=self.preview, interpolation=self.interpolation)
+        return self.canvas
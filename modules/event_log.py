@@ -0,0 +1,282 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/event_log.py
+#
+# Session event stream: one compact JSON object per line, written by a
+# background thread to gzip files that rotate by size and by day. Every file
+# starts with a "session" line naming the user, so files can be analyzed on
+# their own and in any order.
+#   python -m modules.event_log analyze [PATH ...] [--idle-gap S] [--json]
+import argparse
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs", "events")
+
+
+class EventLog:
+    def __init__(self, directory=DEFAULT_LOG_DIR, user="default", max_bytes=4 * 1024 * 1024,
+                 flush_interval=5.0, max_queue=4096):
+        self.directory = directory
+        self.user = user
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.file = None
+        self.file_bytes = 0
+        self.file_day = None
+        self.part = 0
+        os.makedirs(directory, exist_ok=True)
+        self.writer = threading.Thread(target=self._run, daemon=True)
+        self.writer.start()
+
+    def log(self, kind, **fields):
+        # Called from the UI loop: stamps and queues, never touches the disk
+        try:
+            self.queue.put_nowait((time.time(), kind, fields))
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        self.queue.put(None)
+        self.writer.join(timeout=2.0)
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush()
+                continue
+            # Drain whatever else is waiting before touching the file
+            items = [item]
+            while item is not None:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                items.append(item)
+            for item in items:
+                if item is None:
+                    self._close()
+                    return
+                self._write(*item)
+
+    def _write(self, stamp, kind, fields):
+        day = time.strftime("%Y%m%d", time.localtime(stamp))
+        if self.file is None or self.file_bytes >= self.max_bytes or day != self.file_day:
+            self._rotate(stamp, day)
+        record = {"t": round(stamp, 3), "ev": kind}
+        record.update(fields)
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        try:
+            self.file.write(line)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not write event log: {e}")
+            self.file = None
+            return
+        self.file_bytes += len(line)
+        self.written += 1
+
+    def _rotate(self, stamp, day):
+        self._close()
+        self.part += 1
+        user = re.sub(r"[^A-Za-z0-9_-]+", "_", self.user) or "default"
+        path = os.path.join(self.directory, f"{user}-{self.session}-{self.part:03d}.jsonl.gz")
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.file_bytes = 0
+        self.file_day = day
+        self._write_header(stamp)
+
+    def _write_header(self, stamp):
+        header = {"t": round(stamp, 3), "ev": "session", "user": self.user, "session": self.session,
+                  "part": self.part}
+        line = json.dumps(header, separators=(",", ":")) + "\n"
+        self.file.write(line)
+        self.file_bytes += len(line)
+
+    def _flush(self):
+        # A sync flush ends the compressed block, so everything logged so far
+        # can be read back even if the app dies before the file is closed
+        if self.file is not None:
+            try:
+                # GzipFile.flush() defaults to Z_SYNC_FLUSH
+                self.file.flush()
+            except (OSError, ValueError) as e:
+                print(f"[ERROR] Could not flush event log: {e}")
+
+    def _close(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError as e:
+                print(f"[ERROR] Could not close event log: {e}")
+            self.file = None
+
+
+# ── Analysis ─────────────────────────────────────────────────────────────────
+
+def log_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".jsonl.gz"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def read_events(path):
+    # Streams one file; a file cut short by a crash yields what was flushed
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+        print(f"[WARNING] {path} ends early ({e}); using the events before that")
+
+
+class Totals:
+    __slots__ = ("blinks", "ignored_blinks", "steps", "confirm_steps", "phrase_steps", "quit_steps",
+                 "chars", "words", "backspaces", "cancels", "spoken", "active_s")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def report(self):
+        minutes = self.active_s / 60
+        return {
+            "active_min": round(minutes, 1),
+            "chars": self.chars,
+            "words": self.words,
+            "cpm": round(self.chars / minutes, 2) if minutes else 0.0,
+            # Text-entry convention: a word is five characters, spaces included
+            "wpm": round(self.chars / 5 / minutes, 2) if minutes else 0.0,
+            # Keyboard scan steps only, comparable with benchmarks/scan_simulator.py;
+            # the YES/NO, phrase panel and quit screen steps are reported apart
+            "steps_per_char": round(self.steps / self.chars, 2) if self.chars else None,
+            "confirm_steps": self.confirm_steps,
+            "phrase_steps": self.phrase_steps,
+            "quit_steps": self.quit_steps,
+            "blinks": self.blinks,
+            # A blink whose selection the user then rejected with NO
+            "false_blink_rate": round(self.cancels / self.blinks, 3) if self.blinks else None,
+            "backspaces": self.backspaces,
+            "ignored_blinks": self.ignored_blinks,
+            "spoken": self.spoken,
+        }
+
+
+def analyze(paths, idle_gap=60.0):
+    # Per (user, day) totals in one pass; memory grows with users x days,
+    # not with the size of the logs. Time between events counts as active
+    # unless the gap is longer than idle_gap
+    totals = {}
+    session = last = None
+    for path in log_files(paths):
+        user = "unknown"
+        for event in read_events(path):
+            kind = event.get("ev")
+            stamp = event.get("t", 0.0)
+            if kind == "session":
+                user = event.get("user", user)
+                # Rotated parts of one session continue its active time
+                if event.get("session") != session:
+                    session, last = event.get("session"), None
+                continue
+            day = time.strftime("%Y-%m-%d", time.localtime(stamp))
+            t = totals.get((user, day))
+            if t is None:
+                t = totals[(user, day)] = Totals()
+            if last is not None and 0 < stamp - last <= idle_gap:
+                t.active_s += stamp - last
+            last = stamp
+
+            if kind == "blink":
+                t.blinks += 1
+            elif kind == "blink_ignored":
+                t.ignored_blinks += 1
+            elif kind == "step":
+                screen = event.get("screen", "keyboard")
+                if screen == "keyboard":
+                    t.steps += 1
+                elif screen == "confirm":
+                    t.confirm_steps += 1
+                elif screen == "phrases":
+                    t.phrase_steps += 1
+                elif screen == "quit":
+                    t.quit_steps += 1
+            elif kind == "commit":
+                key = event.get("key")
+                if key == "/":
+                    t.backspaces += 1
+                elif key == "-":
+                    # ENTER ends the message; counted as one character like
+                    # benchmarks/scan_simulator.py does
+                    t.chars += 1
+                else:
+                    t.chars += max(0, event.get("added", 0))
+                if event.get("word_end"):
+                    t.words += 1
+            elif kind == "cancel":
+                t.cancels += 1
+            elif kind == "speak":
+                t.spoken += 1
+    return {key: t.report() for key, t in sorted(totals.items())}
+
+
+def print_report(report):
+    print(f"{'user':<14}{'day':<12}{'min':>7}{'chars':>7}{'cpm':>7}{'wpm':>7}{'steps/ch':>9}"
+          f"{'confirm':>8}{'phrase':>7}{'quit':>5}{'blinks':>8}{'false':>7}")
+    for (user, day), r in report.items():
+        steps = f"{r['steps_per_char']:.2f}" if r["steps_per_char"] is not None else "-"
+        false = f"{r['false_blink_rate']:.1%}" if r["false_blink_rate"] is not None else "-"
+        print(f"{user:<14}{day:<12}{r['active_min']:>7.1f}{r['chars']:>7}{r['cpm']:>7.2f}{r['wpm']:>7.2f}"
+              f"{steps:>9}{r['confirm_steps']:>8}{r['phrase_steps']:>7}{r['quit_steps']:>5}"
+              f"{r['blinks']:>8}{false:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Communication rate per user and day from session event logs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("analyze", help="report cpm, wpm, scan steps per character and false blinks")
+    p.add_argument("paths", nargs="*", default=[DEFAULT_LOG_DIR], help="log files or directories")
+    p.add_argument("--idle-gap", type=float, default=60.0, help="longer pauses do not count as typing time")
+    p.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    report = analyze(args.paths, args.idle_gap)
+    if args.json:
+        print(json.dumps([dict(user=user, day=day, **r) for (user, day), r in report.items()], indent=2))
+    else:
+        print_report(report)
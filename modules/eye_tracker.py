@@ -21,12 +21,29 @@
 
 # eye_tracker.py
 import time
+from collections import namedtuple
 import cv2
+import numpy as np
 import mediapipe as mp
+from modules.blink_detector import BlinkDetector, EYE_LANDMARKS
+from modules.frame_pool import FramePool
+
+# frame is the mirrored BGR frame (a frame pool buffer, valid until the next
+# process() call), face the MediaPipe landmarks (or None).
+# Landmarks are normalized to roi, the (x, y, w, h) region of frame that was
+# passed to the face mesh. ear is the smoothed eye aspect ratio when the EAR
+# blink engine is in use.
+TrackerResult = namedtuple("TrackerResult", ["frame", "face", "blink", "roi", "inference_ms", "ear"],
+                           defaults=(None,))
+
+FACE_OVAL = sorted({i for edge in mp.solutions.face_mesh.FACEMESH_FACE_OVAL for i in edge})
 
 class EyeTracker:
-    def __init__(self, camera):
-        self.cap = camera  # Camera class instance
+    def __init__(self, camera, roi_tracking=False, roi_padding=0.3, roi_margin=0.1, inference_scale=1.0,
+                 idle_after_frames=90, idle_probe_hz=2.0, blink_engine="ear", blink_settings=None, frame_pool=None):
+        # Camera class instance; may be None while the camera is still being
+        # opened and set later, process() does not need it
+        self.cap = camera
         print("[INFO] EyeTracker initialized with custom camera.")
 
         self.face_mesh = mp.solutions.face_mesh.FaceMesh(
@@ -44,26 +61,117 @@ class EyeTracker:
         self.last_blink_time = 0
         self.blink_cooldown = 0.50  # seconds
 
+        # "ear" uses the temporal eye-aspect-ratio detector, "lid_gap" the
+        # original fixed pixel threshold
+        self.blink_engine = blink_engine
+        self.blink_detector = BlinkDetector(**(blink_settings or {}))
+        self.eye_indices = EYE_LANDMARKS.ravel()
+
+        # ROI tracking: crop a padded box around the last face instead of
+        # running the mesh over the whole frame; None means search the full frame
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding
+        self.roi_margin = roi_margin
+        self.inference_scale = inference_scale
+        self.roi = None
+        self.inference_ms = 0.0
+        self.avg_inference_ms = 0.0
+        self.reacquisitions = 0
+
+        # Adaptive detection: full rate while a face is tracked, a slow probe
+        # after idle_after_frames frames in a row without one
+        self.idle_after_frames = idle_after_frames
+        self.idle_probe_interval = 1.0 / idle_probe_hz if idle_probe_hz > 0 else 0.0
+        self.state = "active"
+        self.state_times = {"active": 0.0, "idle": 0.0}
+        self.state_clock = time.monotonic()
+        self.empty_frames = 0
+        self.last_probe = 0.0
+        self.frames_inferred = 0
+        self.frames_skipped = 0
+
+        # Mirror, color conversion and inference scaling write into reused
+        # buffers instead of allocating three new frames every call
+        self.frame_pool = frame_pool or FramePool()
+
+    @property
+    def idle(self):
+        return self.state == "idle"
+
+    def detection_stats(self):
+        return {
+            "state": self.state,
+            "active_s": round(self.state_times["active"], 1),
+            "idle_s": round(self.state_times["idle"], 1),
+            "frames_inferred": self.frames_inferred,
+            "frames_skipped": self.frames_skipped,
+            "reacquisitions": self.reacquisitions,
+        }
+
+    def _set_state(self, state, now):
+        self.state_times[self.state] += now - self.state_clock
+        self.state_clock = now
+        if state != self.state:
+            print(f"[INFO] Eye tracker {self.state} -> {state}")
+            self.state = state
+
     def get_frame(self):
         frame = self.cap.get_frame()
         if frame is None:
             return None, None, False, None
+        result = self.process(frame)
+        return result.frame, None, result.blink, None
+
+    def process(self, frame, timestamp=None):
+        pool = self.frame_pool
+        pool.tick()
+        frame = cv2.flip(frame, 1, dst=pool.get("mirrored", frame.shape))
+        ih, iw, _ = frame.shape
 
-        frame = cv2.flip(frame, 1)
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb)
+        now = time.monotonic()
+        if timestamp is None:
+            timestamp = now
+        self._set_state(self.state, now)
+        if self.idle and now - self.last_probe < self.idle_probe_interval:
+            self.frames_skipped += 1
+            return TrackerResult(frame, None, False, None, 0.0)
+        self.last_probe = now
+        self.frames_inferred += 1
+
+        roi = self.roi if self.roi_tracking and self.roi is not None else (0, 0, iw, ih)
+        results = self._infer(frame, roi)
 
         blink = False
 
         if not results.multi_face_landmarks:
-            return frame, None, False, None
-
+            if self.roi is not None:
+                self.reacquisitions += 1
+            self.roi = None
+            self.empty_frames += 1
+            self.blink_detector.reset()
+            if self.empty_frames >= self.idle_after_frames:
+                self._set_state("idle", now)
+            return TrackerResult(frame, None, False, roi, self.inference_ms)
+
+        self.empty_frames = 0
+        self._set_state("active", now)
         face = results.multi_face_landmarks[0]
-        ih, iw, _ = frame.shape
+        if self.roi_tracking:
+            self.roi = self._next_roi(face, roi, iw, ih)
+
+        rx, ry, rw, rh = roi
+
+        if self.blink_engine == "ear":
+            # One pass over the 12 eye landmarks into pixel space; EAR needs
+            # square pixels, so scale x and y by the ROI size separately
+            norm = np.array([(face.landmark[i].x, face.landmark[i].y) for i in self.eye_indices])
+            points = (norm * (rw, rh) + (rx, ry)).reshape(EYE_LANDMARKS.shape + (2,))
+            blink = self.blink_detector.update(points, timestamp)
+            return TrackerResult(frame, face, blink, roi, self.inference_ms, self.blink_detector.ear)
 
         def pt(index):
             lm = face.landmark[index]
-            return int(lm.x * iw), int(lm.y * ih)
+            return int(rx + lm.x * rw), int(ry + lm.y * rh)
 
         try:
             top_lid_l, bottom_lid_l = pt(self.left_lid_top), pt(self.left_lid_bottom)
@@ -72,15 +180,60 @@ class EyeTracker:
             height_l = abs(bottom_lid_l[1] - top_lid_l[1])
             height_r = abs(bottom_lid_r[1] - top_lid_r[1])
 
-            current_time = time.time()
-            if (height_l < 10 or height_r < 10) and (current_time - self.last_blink_time > self.blink_cooldown):
+            if (height_l < 10 or height_r < 10) and (timestamp - self.last_blink_time > self.blink_cooldown):
                 blink = True
-                self.last_blink_time = current_time
+                self.last_blink_time = timestamp
 
         except Exception as e:
             print(f"[INFO] Blink detection error: {e}")
 
-        return frame, None, blink, None
+        return TrackerResult(frame, face, blink, roi, self.inference_ms)
+
+    def _infer(self, frame, roi):
+        # Only the ROI is converted to RGB, straight into a contiguous pool
+        # buffer, so no separate crop copy is needed for the face mesh
+        pool = self.frame_pool
+        x, y, w, h = roi
+        image = cv2.cvtColor(frame[y:y + h, x:x + w], cv2.COLOR_BGR2RGB, dst=pool.get("rgb", (h, w, 3)))
+        if self.inference_scale < 1.0:
+            sw = max(1, int(round(w * self.inference_scale)))
+            sh = max(1, int(round(h * self.inference_scale)))
+            image = cv2.resize(image, (sw, sh), dst=pool.get("inference", (sh, sw, 3)),
+                               interpolation=cv2.INTER_AREA)
+
+        started = time.perf_counter()
+        results = self.face_mesh.process(image)
+        self.inference_ms = (time.perf_counter() - started) * 1000
+        self.avg_inference_ms = 0.9 * self.avg_inference_ms + 0.1 * self.inference_ms if self.avg_inference_ms else self.inference_ms
+        return results
+
+    def _next_roi(self, face, roi, iw, ih):
+        rx, ry, rw, rh = roi
+        xs = [rx + face.landmark[i].x * rw for i in FACE_OVAL]
+        ys = [ry + face.landmark[i].y * rh for i in FACE_OVAL]
+        x1, x2, y1, y2 = min(xs), max(xs), min(ys), max(ys)
+
+        # Keep the crop steady while the face stays well inside it; the mesh
+        # tracks landmarks between frames and a crop that moves every frame
+        # shifts the image under it
+        if self.roi is not None:
+            mx, my = rw * self.roi_margin, rh * self.roi_margin
+            face_area = (x2 - x1) * (y2 - y1)
+            if (x1 > rx + mx and x2 < rx + rw - mx and y1 > ry + my and y2 < ry + rh - my
+                    and face_area > 0.25 * rw * rh):
+                return self.roi
+
+        # Square box around the face plus padding, clipped to the frame
+        size = max(x2 - x1, y2 - y1) * (1 + 2 * self.roi_padding)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        nx1 = int(max(0, cx - size / 2))
+        ny1 = int(max(0, cy - size / 2))
+        nx2 = int(min(iw, cx + size / 2))
+        ny2 = int(min(ih, cy + size / 2))
+        if nx2 - nx1 < 32 or ny2 - ny1 < 32:
+            return None
+        return (nx1, ny1, nx2 - nx1, ny2 - ny1)
 
     def release(self):
-        self.cap.release()
+        if self.cap is not None:
+            self.cap.release()
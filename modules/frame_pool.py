@@ -0,0 +1,63 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/frame_pool.py
+#
+# Preallocated per-frame buffers. Each buffer is a flat byte array that is
+# handed out as a contiguous view of the requested shape, so a changing ROI
+# size reuses the same memory and only growth past the largest size seen so
+# far allocates. Buffers are overwritten on the next frame: consumers must
+# not keep a reference past the frame they got it for.
+import numpy as np
+
+
+class FramePool:
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.frames = 0
+        self.mark_frames = 0
+        self.mark_allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        buf = self.buffers.get(name)
+        if buf is None or buf.nbytes < size:
+            if buf is not None:
+                self.allocated_bytes -= buf.nbytes
+            buf = self.buffers[name] = np.empty(size, dtype=np.uint8)
+            self.allocations += 1
+            self.allocated_bytes += size
+        return buf[:size].view(dtype).reshape(shape)
+
+    def tick(self):
+        self.frames += 1
+
+    def allocations_per_frame(self):
+        # Since the last call; 0.0 once every buffer has reached its steady size
+        frames = self.frames - self.mark_frames
+        allocations = self.allocations - self.mark_allocations
+        self.mark_frames, self.mark_allocations = self.frames, self.allocations
+        return allocations / frames if frames else 0.0
+
+    def summary_line(self):
+        return (f"[INFO] Frame pool: {len(self.buffers)} buffers, {self.allocated_bytes / 2 ** 20:.1f} MB, "
+                f"{self.allocations} allocations total, {self.allocations_per_frame():.3f} per frame since last report")
@@ -0,0 +1,137 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/metrics.py
+import json
+import time
+from collections import deque
+
+import cv2
+
+
+class _Span:
+    __slots__ = ("samples", "started")
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.started)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+class Metrics:
+    # Rolling-window stage timings. Spans are reused per stage and only
+    # append a float on exit; percentiles are computed on demand.
+    def __init__(self, enabled=True, window=300, export_path=None, export_interval=10.0):
+        self.enabled = enabled
+        self.window = window
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self.samples = {}
+        self.spans = {}
+        self.order = []
+        self.last_export = time.monotonic()
+
+    def _samples(self, name):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            self.order.append(name)
+        return samples
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = _Span(self._samples(name))
+        return span
+
+    def record(self, name, seconds):
+        if self.enabled:
+            self._samples(name).append(seconds)
+
+    def summary(self):
+        result = {}
+        for name in self.order:
+            values = sorted(self.samples[name])
+            if not values:
+                continue
+            result[name] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        return result
+
+    def summary_line(self):
+        return ", ".join(f"{name} {stats['p50_ms']:.1f}/{stats['p99_ms']:.1f}"
+                         for name, stats in self.summary().items())
+
+    def maybe_export(self, now=None):
+        # Append one JSON line per interval; returns True when a line was written
+        if not self.enabled or self.export_path is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - self.last_export < self.export_interval:
+            return False
+        self.last_export = now
+        line = json.dumps({"time": time.time(), "stages": self.summary()})
+        try:
+            with open(self.export_path, "a") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"[ERROR] Could not write metrics to {self.export_path}: {e}")
+        return True
+
+    def draw_overlay(self, frame, origin=(10, 20)):
+        x, y = origin
+        for name, stats in self.summary().items():
+            text = f"{name}: {stats['p50_ms']:.1f} / {stats['p99_ms']:.1f} ms"
+            cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
+            y += 16
+        return frame
@@ -0,0 +1,80 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/scan_planner.py
+import bisect
+from modules.word_index import PREFIX_END, cumulative_weights
+
+
+class ScanPlanner:
+    # Conditional probability of the next key given the partial word, from
+    # the dictionary: every word weighs one plus its unigram count, and the
+    # probability of a letter is the weight of the words that continue with
+    # it. "." (space) gets the weight of the partial word itself.
+    def __init__(self, word_index, counts=None, cache_size=4096):
+        self.index = word_index
+        self.words = word_index.words
+        self.cache_size = cache_size
+        self._cache = {}
+
+        # Cumulative weights over the sorted words, so any prefix block sums
+        # in O(1); a compiled index carries them precomputed
+        if word_index.cumulative is not None:
+            self.cumulative = word_index.cumulative
+        else:
+            self.cumulative = cumulative_weights(self.words, counts)
+
+    def block_weight(self, lo, hi):
+        return self.cumulative[hi] - self.cumulative[lo]
+
+    def probabilities(self, prefix):
+        cached = self._cache.get(prefix)
+        if cached is not None:
+            return cached
+
+        lo, hi = self.index.prefix_range(prefix)
+        total = self.block_weight(lo, hi)
+        probs = {}
+        if total > 0:
+            n = len(prefix)
+            if len(self.words[lo]) == n:
+                probs["."] = self.block_weight(lo, lo + 1) / total
+                lo += 1
+            while lo < hi:
+                letter = self.words[lo][n]
+                end = bisect.bisect_left(self.words, prefix + letter + PREFIX_END, lo, hi)
+                probs[letter] = self.block_weight(lo, end) / total
+                lo = end
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[prefix] = probs
+        return probs
+
+    def word_probability(self, prefix, word):
+        lo, hi = self.index.prefix_range(prefix)
+        i = bisect.bisect_left(self.words, word, lo, hi)
+        if i == hi or self.words[i] != word:
+            return 0.0
+        return self.block_weight(i, i + 1) / self.block_weight(lo, hi)
+
+    def rank(self, scored):
+        # scored: (entry, probability) pairs in layout order; the sort is
+        # stable, so equally likely keys keep their place on the keyboard
+        return [entry for entry, _ in sorted(scored, key=lambda item: -item[1])]
@@ -0,0 +1,106 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/scheduler.py
+import time
+from collections import deque
+from modules.metrics import percentile
+
+
+class Scheduler:
+    # Named deadlines on the monotonic clock. The main loop sleeps until the
+    # next deadline (or the next camera frame) instead of polling, and each
+    # event records how late it was handled.
+    def __init__(self, clock=time.monotonic, window=300):
+        self.clock = clock
+        self.window = window
+        self.deadlines = {}
+        self.fired = {}
+        self.lateness = {}
+
+    def now(self):
+        return self.clock()
+
+    def at(self, name, deadline):
+        self.deadlines[name] = deadline
+
+    def after(self, name, delay):
+        self.deadlines[name] = self.clock() + delay
+
+    def then(self, name, delay):
+        # Count from the deadline that just fired rather than from now, so a
+        # periodic event keeps its rhythm however late the loop got to it;
+        # fall back to now once it is a whole period behind
+        now = self.clock()
+        last = self.fired.get(name)
+        base = last if last is not None and now - last < delay else now
+        self.deadlines[name] = base + delay
+
+    def cancel(self, name):
+        self.deadlines.pop(name, None)
+
+    def pending(self, name):
+        return name in self.deadlines
+
+    def due(self, name, now=None):
+        # True once when the deadline has passed; the event is then cleared
+        deadline = self.deadlines.get(name)
+        if deadline is None:
+            return False
+        if now is None:
+            now = self.clock()
+        if now < deadline:
+            return False
+        del self.deadlines[name]
+        self.fired[name] = deadline
+        samples = self.lateness.get(name)
+        if samples is None:
+            samples = self.lateness[name] = deque(maxlen=self.window)
+        samples.append(now - deadline)
+        return True
+
+    def next_deadline(self):
+        return min(self.deadlines.values(), default=None)
+
+    def time_until_next(self, limit=None, now=None):
+        deadline = self.next_deadline()
+        if deadline is None:
+            return limit
+        if now is None:
+            now = self.clock()
+        remaining = max(0.0, deadline - now)
+        return remaining if limit is None else min(remaining, limit)
+
+    def jitter_stats(self):
+        stats = {}
+        for name, samples in self.lateness.items():
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            stats[name] = {
+                "count": len(ordered),
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return stats
+
+    def summary_line(self):
+        return ", ".join(f"{name} {s['p50_ms']:.1f}/{s['p99_ms']:.1f}"
+                         for name, s in self.jitter_stats().items())
@@ -0,0 +1,92 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/speech_cache.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "speech")
+
+
+class SpeechCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Least recently used first; file mtime carries recency across runs
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".wav"):
+                st = os.stat(os.path.join(directory, name))
+                entries.append((st.st_mtime, name, st.st_size))
+        self.entries = OrderedDict((name, size) for _, name, size in sorted(entries))
+        self.total_bytes = sum(self.entries.values())
+
+    @staticmethod
+    def key(text, voice):
+        payload = json.dumps([text, voice], sort_keys=True).encode("utf-8")
+        return hashlib.sha1(payload).hexdigest()
+
+    def path_for(self, text, voice):
+        return os.path.join(self.directory, self.key(text, voice) + ".wav")
+
+    def get(self, text, voice):
+        name = self.key(text, voice) + ".wav"
+        with self.lock:
+            if name not in self.entries:
+                return None
+            self.entries.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)
+        except OSError:
+            # Deleted behind our back
+            with self.lock:
+                self.total_bytes -= self.entries.pop(name, 0)
+            return None
+        return path
+
+    def add(self, text, voice, render):
+        # render(path) writes the audio for text to path
+        path = self.path_for(text, voice)
+        tmp_path = path + ".tmp"
+        render(tmp_path)
+        os.replace(tmp_path, path)
+
+        name = os.path.basename(path)
+        size = os.path.getsize(path)
+        with self.lock:
+            self.total_bytes += size - self.entries.pop(name, 0)
+            self.entries[name] = size
+            self._evict()
+        return path
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            name, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
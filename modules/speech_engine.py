@@ -18,11 +18,342 @@
 # └────────────────────────────────────────────────────────────────────────────┘
 
 # modules/speech_engine.py
+import queue
 import subprocess
+import threading
+import time
+from collections import OrderedDict, deque
+
+from modules.metrics import percentile
+from modules.speech_speculator import SpeechSpeculator
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
+
+BACKENDS = ("espeak", "pyttsx3")
 
 class SpeechEngine:
-    def say(self, text):
+    def __init__(self, rate=140, pitch=70, max_queue=4, cache=None, max_loaded_sounds=32,
+                 backend="espeak", max_restarts=3, latency_window=100, speculative=False):
+        self.rate = rate
+        self.pitch = pitch
+        if backend not in BACKENDS:
+            print(f"[WARNING] Unknown speech backend '{backend}', using espeak")
+            backend = "espeak"
+        if backend == "pyttsx3" and pyttsx3 is None:
+            print("[WARNING] pyttsx3 is not installed, using espeak")
+            backend = "espeak"
+        # "espeak" spawns one process per utterance; "pyttsx3" keeps its
+        # engine loaded on the speech thread (on Linux its espeak driver
+        # still plays every utterance through aplay). Rendered audio - the
+        # phrase cache and speculative sentences - always comes from espeak -w
+        self.backend = backend
+        self.tts = None
+        self.current_tts = None
+        self.tts_restarts = 0
+        self.max_restarts = max_restarts
+        # Seconds from say() to the first audible output, per utterance; only
+        # known for pre-rendered audio, where playback starts here
+        self.first_audio = deque(maxlen=latency_window)
+        # Seconds from say() to the synthesizer starting (pyttsx3's first
+        # word event, the espeak process spawn); audio follows after synthesis
+        self.synthesis_start = deque(maxlen=latency_window)
+        self.first_audio_pending = None
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.current = None
+        self.current_channel = None
+        self.generation = 0
+        self.cache = cache
+        self.sounds = OrderedDict()
+        self.max_loaded_sounds = max_loaded_sounds
+        self.lock = threading.Lock()
+        # Renders the sentence being typed ahead of ENTER; see speculate()
+        self.speculator = SpeechSpeculator(self._render_sound) if speculative else None
+        self.worker = None
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        if self.worker is not None:
+            if self.worker.is_alive():
+                return
+            print("[WARNING] Speech thread died, restarting it")
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def command(self, text, wav_path=None):
+        cmd = ["espeak", "-s", str(self.rate), "-p", str(self.pitch)]
+        if wav_path is not None:
+            cmd += ["-w", wav_path]
+        return cmd + [text]
+
+    @property
+    def voice(self):
+        # Cache key of rendered audio, which espeak always produces
+        return {"engine": "espeak", "rate": self.rate, "pitch": self.pitch}
+
+    def render(self, text, path):
+        # Writes text to a wav file at path. pyttsx3 is never used for this:
+        # it only runs on the speech thread, and on Linux its save_to_file
+        # needs ffmpeg and replays the last spoken sentence
+        subprocess.run(self.command(text, wav_path=path), check=True, capture_output=True)
+
+    def say(self, text, on_done=None, interrupt=False):
+        # Queue text and return immediately; on_done(text, completed) runs on
+        # the speech thread once the utterance finishes, fails or is cancelled
+        if interrupt:
+            self.cancel()
+        self._ensure_worker()
         try:
-            subprocess.run(["espeak", "-s", "140", "-p", "70", text], check=True)
+            self.queue.put_nowait((text, on_done, self.generation, time.monotonic()))
+            return True
+        except queue.Full:
+            print(f"[WARNING] Speech queue full - dropping: {text}")
+            return False
+
+    def cancel(self):
+        # Drop everything still queued and cut off the current utterance
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.queue.task_done()
+            if item is not None:
+                self._notify(item[0], item[1], False)
+        with self.lock:
+            # Anything the worker already dequeued but has not started is stale too
+            self.generation += 1
+            if self.current is not None and self.current.poll() is None:
+                self.current.terminate()
+            if self.current_channel is not None:
+                self.current_channel.stop()
+            if self.current_tts is not None:
+                self.current_tts.stop()
+
+    @property
+    def is_speaking(self):
+        return (self.current is not None or self.current_channel is not None or self.current_tts is not None
+                or not self.queue.empty())
+
+    def wait(self):
+        self.queue.join()
+
+    def stop(self):
+        self.cancel()
+        if self.speculator is not None:
+            self.speculator.stop()
+        self.queue.put(None)
+        self.worker.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                text, on_done, generation, queued_at = item
+                self._notify(text, on_done, self._speak(text, generation, queued_at))
+            finally:
+                self.queue.task_done()
+
+    def prewarm(self, texts):
+        # Render missing cache entries in the background so phrases play
+        # from disk instead of being synthesized when they are picked
+        if self.cache is None:
+            return None
+        thread = threading.Thread(target=self._prewarm, args=(list(texts),), daemon=True)
+        thread.start()
+        return thread
+
+    def _prewarm(self, texts):
+        started = time.perf_counter()
+        rendered = 0
+        for text in texts:
+            try:
+                voice = self.voice
+                path = self.cache.get(text, voice)
+                if path is None:
+                    path = self.cache.add(text, voice, lambda out: self.render(text, out))
+                    rendered += 1
+                self._load_sound(text, path)
+            except Exception as e:
+                print(f"[ERROR] Failed to pre-render '{text}': {e}")
+        elapsed = time.perf_counter() - started
+        print(f"[INFO] Speech cache warm: {len(texts)} phrases ({rendered} rendered) in {elapsed:.1f}s")
+
+    def _mixer_ready(self):
+        return pygame is not None and pygame.mixer.get_init() is not None
+
+    def _load_sound(self, text, path):
+        if not self._mixer_ready():
+            return None
+        with self.lock:
+            sound = self.sounds.get(text)
+            if sound is not None:
+                self.sounds.move_to_end(text)
+                return sound
+        sound = pygame.mixer.Sound(path)
+        with self.lock:
+            self.sounds[text] = sound
+            while len(self.sounds) > self.max_loaded_sounds:
+                self.sounds.popitem(last=False)
+        return sound
+
+    def _first_audio(self, queued_at):
+        self.first_audio.append(time.monotonic() - queued_at)
+
+    def _synthesis_started(self, queued_at):
+        self.synthesis_start.append(time.monotonic() - queued_at)
+
+    def latency_summary(self):
+        if not self.first_audio and not self.synthesis_start:
+            return None
+        summary = {
+            "restarts": self.tts_restarts,
+            "speculative_hits": self.speculator.hits if self.speculator is not None else 0,
+        }
+        for name, samples in (("first_audio", self.first_audio), ("synthesis_start", self.synthesis_start)):
+            values = sorted(samples)
+            summary[name] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+            } if values else None
+        return summary
+
+    def speculate(self, text_buffer):
+        # Called with the text buffer as it changes; every change starts
+        # rendering what ENTER would speak in the background
+        if self.speculator is not None and self._mixer_ready():
+            self.speculator.update(text_buffer)
+
+    def _render_sound(self, text, path):
+        # Runs on the speculator's thread
+        self.render(text, path)
+        return pygame.mixer.Sound(path)
+
+    def _play_speculative(self, text, generation, queued_at):
+        if self.speculator is None or not self._mixer_ready():
+            return None
+        sound = self.speculator.take(text)
+        if sound is None:
+            return None
+        return self._play_sound(sound, generation, queued_at)
+
+    def _play_cached(self, text, generation, queued_at):
+        path = self.cache.get(text, self.voice) if self.cache is not None else None
+        if path is None or not self._mixer_ready():
+            return None
+        try:
+            sound = self._load_sound(text, path)
+        except Exception as e:
+            print(f"[ERROR] Failed to load cached speech: {e}")
+            return None
+        return self._play_sound(sound, generation, queued_at)
+
+    def _play_sound(self, sound, generation, queued_at):
+        try:
+            with self.lock:
+                if generation != self.generation:
+                    return False
+                self.current_channel = sound.play()
+            self._first_audio(queued_at)
+            while self.current_channel is not None and self.current_channel.get_busy():
+                time.sleep(0.01)
+            return generation == self.generation
+        except Exception as e:
+            print(f"[ERROR] Failed to play speech audio: {e}")
+            return None
+        finally:
+            with self.lock:
+                self.current_channel = None
+
+    def _tts_engine(self):
+        # Created on the speech thread, which is the only one that drives it
+        if self.tts is None:
+            engine = pyttsx3.init()
+            engine.setProperty("rate", self.rate)
+            engine.connect("started-word", self._on_word)
+            self.tts = engine
+        return self.tts
+
+    def _on_word(self, name, location, length):
+        # Fires when synthesis starts, before the driver plays anything
+        queued_at, self.first_audio_pending = self.first_audio_pending, None
+        if queued_at is not None:
+            self._synthesis_started(queued_at)
+
+    def _restart_tts(self, error):
+        # Drop the broken engine; the next utterance creates a fresh one.
+        # After max_restarts failures the rest of the session uses espeak
+        print(f"[ERROR] pyttsx3 failed: {error}")
+        engine, self.tts = self.tts, None
+        if engine is not None:
+            try:
+                engine.stop()
+            except Exception:
+                pass
+        self.tts_restarts += 1
+        if self.tts_restarts >= self.max_restarts:
+            print(f"[WARNING] pyttsx3 failed {self.tts_restarts} times, switching to espeak")
+            self.backend = "espeak"
+
+    def _speak_pyttsx3(self, text, generation, queued_at):
+        try:
+            engine = self._tts_engine()
+            with self.lock:
+                if generation != self.generation:
+                    return False
+                self.current_tts = engine
+                self.first_audio_pending = queued_at
+            engine.say(text)
+            engine.runAndWait()
+            return generation == self.generation
+        except Exception as e:
+            self._restart_tts(e)
+            return None
+        finally:
+            with self.lock:
+                self.current_tts = None
+                self.first_audio_pending = None
+
+    def _speak(self, text, generation, queued_at):
+        played = self._play_speculative(text, generation, queued_at)
+        if played is None:
+            played = self._play_cached(text, generation, queued_at)
+        if played is not None:
+            return played
+        if self.backend == "pyttsx3":
+            played = self._speak_pyttsx3(text, generation, queued_at)
+            if played is not None:
+                return played
+        try:
+            with self.lock:
+                if generation != self.generation:
+                    return False
+                self.current = subprocess.Popen(self.command(text))
+            # espeak plays once it has synthesized the first clause; only the
+            # spawn can be timed from here
+            self._synthesis_started(queued_at)
+            return self.current.wait() == 0
         except Exception as e:
             print(f"[ERROR] Failed to speak: {e}")
+            return False
+        finally:
+            with self.lock:
+                self.current = None
+
+    def _notify(self, text, on_done, completed):
+        if on_done is None:
+            return
+        try:
+            on_done(text, completed)
+        except Exception as e:
+            print(f"[ERROR] Speech callback failed: {e}")
@@ -0,0 +1,132 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/speech_speculator.py
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def spoken_text(text_buffer):
+    # What ENTER would speak right now, partial last word included
+    return text_buffer.strip()
+
+
+class SpeechSpeculator:
+    # Renders what ENTER would speak whenever the buffer changes, on its own
+    # thread and into memory, so ENTER plays audio that already exists.
+    # Scanning commits at most one character per scan step, which leaves
+    # each render more than a second. Renders that stop being a prefix of
+    # the buffer (the next letter, backspace) are dropped; the ones for
+    # whole earlier words stay valid and are kept.
+    def __init__(self, render, max_sentences=8):
+        # render(text, path) writes a wav for text to path and returns it
+        # loaded as a playable sound
+        self.render = render
+        self.max_sentences = max_sentences
+        self.sounds = OrderedDict()
+        self.target = ""
+        self.in_flight = None
+        self.failed = None
+        self.rendered = 0
+        self.hits = 0
+        self.misses = 0
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def update(self, text_buffer):
+        # Cheap enough to call every frame; only a changed sentence wakes the thread
+        sentence = spoken_text(text_buffer)
+        with self.condition:
+            if sentence == self.target:
+                return
+            self.target = sentence
+            for text in [t for t in self.sounds if not self._still_valid(t)]:
+                del self.sounds[text]
+            self.condition.notify_all()
+
+    def _still_valid(self, text):
+        # An empty buffer usually means ENTER just queued the sentence; keep
+        # its sound (or finish its render) until the speech thread takes it
+        target = self.target
+        return not target or target == text or target.startswith(text + " ")
+
+    def take(self, text, timeout=2.0):
+        # The pre-rendered sound for text, waiting for it if it is being
+        # rendered right now; None when speech has to be synthesized
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while self.in_flight == text and text not in self.sounds:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            sound = self.sounds.pop(text, None)
+        if sound is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return sound
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and (self.target in ("", self.failed) or self.target in self.sounds):
+                    self.condition.wait()
+                if not self.running:
+                    return
+                text = self.in_flight = self.target
+            sound = self._render(text)
+            with self.condition:
+                self.in_flight = None
+                # Typing may have moved on (or backspaced) while rendering
+                if sound is not None and self._still_valid(text):
+                    self.sounds[text] = sound
+                    while len(self.sounds) > self.max_sentences:
+                        self.sounds.popitem(last=False)
+                elif sound is None:
+                    # Not retried until the sentence changes
+                    self.failed = text
+                self.condition.notify_all()
+
+    def _render(self, text):
+        fd, path = tempfile.mkstemp(prefix="eyespeak_", suffix=".wav")
+        os.close(fd)
+        try:
+            sound = self.render(text, path)
+            self.rendered += 1
+            return sound
+        except Exception as e:
+            print(f"[ERROR] Speculative synthesis failed for '{text}': {e}")
+            return None
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
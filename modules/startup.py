@@ -0,0 +1,115 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/startup.py
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class StartupTask:
+    def __init__(self, name, deps):
+        self.name = name
+        self.deps = deps
+        self.future = Future()
+        self.started = None
+        self.finished = None
+
+
+class Startup:
+    # Runs the slow parts of startup (imports, camera, models, files) on
+    # worker threads while the main thread keeps the splash screen alive.
+    # A task starts as soon as the tasks it depends on have finished and is
+    # called with their results, in order.
+    def __init__(self, max_workers=6):
+        self.t0 = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.tasks = {}
+        self.marks = []
+        self.lock = threading.Lock()
+
+    def add(self, name, func, *deps):
+        task = StartupTask(name, [self.tasks[dep] for dep in deps])
+        self.tasks[name] = task
+        if not task.deps:
+            self.executor.submit(self._run, task, func)
+            return task
+
+        pending = [len(task.deps)]
+
+        def dep_done(_):
+            with self.lock:
+                pending[0] -= 1
+                ready = pending[0] == 0
+            if ready:
+                self.executor.submit(self._run, task, func)
+
+        for dep in task.deps:
+            dep.future.add_done_callback(dep_done)
+        return task
+
+    def _run(self, task, func):
+        task.started = self.elapsed_ms()
+        try:
+            args = [dep.future.result() for dep in task.deps]
+            task.future.set_result(func(*args))
+        except BaseException as e:
+            task.future.set_exception(e)
+        finally:
+            task.finished = self.elapsed_ms()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    def done(self, name):
+        return self.tasks[name].future.done()
+
+    def result(self, name, timeout=None):
+        return self.tasks[name].future.result(timeout)
+
+    def mark(self, name):
+        # Milestones on the main thread (splash finished, first frame shown)
+        self.marks.append((name, self.elapsed_ms()))
+
+    def timeline(self):
+        rows = []
+        for task in self.tasks.values():
+            if task.future.done():
+                status = "failed" if task.future.exception() is not None else "ok"
+            else:
+                status = "running" if task.started is not None else "waiting"
+            rows.append({"name": task.name, "start_ms": task.started, "end_ms": task.finished, "status": status})
+        for name, at in self.marks:
+            rows.append({"name": name, "start_ms": at, "end_ms": at, "status": "mark"})
+        return sorted(rows, key=lambda row: row["start_ms"] if row["start_ms"] is not None else float("inf"))
+
+    def report(self):
+        print("[INFO] Startup timeline (ms since launch):")
+        for row in self.timeline():
+            if row["status"] == "mark":
+                print(f"[INFO]   {row['name']:<14} {row['start_ms']:8.0f}")
+            elif row["start_ms"] is None:
+                print(f"[INFO]   {row['name']:<14} {'-':>8}  {row['status']}")
+            else:
+                end = f"{row['end_ms']:8.0f}" if row["end_ms"] is not None else f"{'-':>8}"
+                duration = f"{row['end_ms'] - row['start_ms']:6.0f} ms" if row["end_ms"] is not None else ""
+                print(f"[INFO]   {row['name']:<14} {row['start_ms']:8.0f} -> {end}  {duration}  {row['status']}")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
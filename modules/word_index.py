@@ -0,0 +1,330 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/word_index.py
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Sorts after every uppercase letter, so prefix + PREFIX_END bounds the
+# block of words that start with prefix.
+PREFIX_END = "\uffff"
+
+# Compiled dictionary layout (little-endian):
+#   header      magic, word count, source size and mtime (ns), counts file
+#               size and mtime (ns; both 0 when compiled without counts)
+#   offsets     (count + 1) x uint32, relative to the start of the word blob
+#   blob        sorted uppercase UTF-8 words, no separators, padded to 8 bytes
+# and, when compiled with a counts file:
+#   cumulative  (count + 1) x float64, running sum of word weights (ScanPlanner)
+#   ranks       count x uint32, completion rank of each word (WordPredictor)
+#   top         prefix count, keep and scan limit as uint32, then for every
+#               prefix covering more than scan limit words: prefix offsets
+#               (prefixes + 1) x uint32, its best word indices by rank
+#               (prefixes x keep) x uint32 padded with NO_WORD, the prefix blob
+COMPILED_MAGIC = b"ESDICT03"
+COMPILED_HEADER = struct.Struct("<8sIQQQQ")
+TOP_HEADER = struct.Struct("<III")
+NO_WORD = 0xFFFFFFFF
+# Completions stored per prefix: the most the UI shows plus the typed word
+TOP_KEEP = 5
+
+
+def read_word_list(path):
+    with open(path, "r") as f:
+        return set(word.strip().upper() for word in f if word.strip().isalpha())
+
+
+def read_unigram_counts(path):
+    # One "word count" pair per line; later duplicates add up
+    counts = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 2 or not parts[0].isalpha():
+                continue
+            try:
+                count = int(float(parts[1]))
+            except ValueError:
+                continue
+            word = parts[0].upper()
+            counts[word] = counts.get(word, 0) + count
+    return counts
+
+
+def word_ranks(words, counts):
+    # Completion rank of every word: most frequent first, then shorter, then
+    # alphabetical
+    counts = counts or {}
+    order = sorted(range(len(words)), key=lambda i: (-counts.get(words[i], 0), len(words[i]), i))
+    ranks = array("I", bytes(4 * len(words)))
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return ranks
+
+
+def cumulative_weights(words, counts):
+    # Every word weighs one plus its count; the running sum lets any prefix
+    # block be weighed in O(1)
+    counts = counts or {}
+    cumulative = array("d", [0.0])
+    total = 0.0
+    for word in words:
+        total += 1 + counts.get(word, 0)
+        cumulative.append(total)
+    return cumulative
+
+
+def file_stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def pack_top_completions(table, keep, scan_limit):
+    prefixes = sorted(table)
+    encoded = [prefix.encode("utf-8") for prefix in prefixes]
+    offsets = [0]
+    for prefix in encoded:
+        offsets.append(offsets[-1] + len(prefix))
+    best = array("I")
+    for prefix in prefixes:
+        row = table[prefix][:keep]
+        best.extend(row + [NO_WORD] * (keep - len(row)))
+    return (TOP_HEADER.pack(len(prefixes), keep, scan_limit) + array("I", offsets).tobytes()
+            + best.tobytes() + b"".join(encoded))
+
+
+def unpack_top_completions(mm, start):
+    # prefix -> best word indices; None if the section is cut short
+    if len(mm) < start + TOP_HEADER.size:
+        return None, None
+    prefixes, keep, scan_limit = TOP_HEADER.unpack_from(mm, start)
+    offsets_start = start + TOP_HEADER.size
+    best_start = offsets_start + 4 * (prefixes + 1)
+    blob_start = best_start + 4 * prefixes * keep
+    if len(mm) < blob_start:
+        return None, None
+    view = memoryview(mm)
+    offsets = view[offsets_start:best_start].cast("I")
+    best = view[best_start:blob_start].cast("I")
+    if len(mm) < blob_start + offsets[prefixes]:
+        return None, None
+    table = {}
+    for i in range(prefixes):
+        prefix = mm[blob_start + offsets[i]:blob_start + offsets[i + 1]].decode("utf-8")
+        table[prefix] = [j for j in best[i * keep:(i + 1) * keep] if j != NO_WORD]
+    return table, (keep, scan_limit)
+
+
+def compile_dictionary(src_path, dst_path, counts_path=None):
+    from modules.word_predictor import WordPredictor
+
+    words = sorted(read_word_list(src_path))
+    encoded = [word.encode("utf-8") for word in words]
+    blob = b"".join(encoded)
+
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+
+    src_size, src_mtime_ns = file_stamp(src_path)
+    counts_size, counts_mtime_ns = file_stamp(counts_path) if counts_path else (0, 0)
+    tmp_path = dst_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(COMPILED_HEADER.pack(COMPILED_MAGIC, len(words), src_size, src_mtime_ns,
+                                     counts_size, counts_mtime_ns))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(blob)
+        f.write(bytes(-f.tell() % 8))
+        if counts_path:
+            counts = read_unigram_counts(counts_path)
+            ranks = word_ranks(words, counts)
+            f.write(cumulative_weights(words, counts).tobytes())
+            f.write(ranks.tobytes())
+            # Building the predictor fills its table of every prefix too
+            # big to rank on a keystroke; stored, it costs nothing at startup
+            index = WordIndex(words, is_sorted=True)
+            index.ranks = ranks
+            predictor = WordPredictor(index, top_k=TOP_KEEP - 1)
+            f.write(pack_top_completions(predictor.table, predictor.keep, predictor.scan_limit))
+    os.replace(tmp_path, dst_path)
+    return len(words)
+
+
+def load_compiled(dst_path, src_path=None, counts_path=None):
+    # The word index, with the precomputed ranks and weights attached when it
+    # was compiled from counts_path as it is now; None if it has to be rebuilt
+    if not os.path.exists(dst_path) or sys.byteorder != "little":
+        return None
+
+    try:
+        with open(dst_path, "rb") as f:
+            # Raises ValueError for an empty file
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Could not map compiled dictionary: {e}")
+        return None
+
+    if len(mm) < COMPILED_HEADER.size:
+        print("[WARNING] Compiled dictionary is truncated.")
+        return None
+    magic, count, src_size, src_mtime_ns, counts_size, counts_mtime_ns = COMPILED_HEADER.unpack_from(mm, 0)
+    if magic != COMPILED_MAGIC:
+        print("[WARNING] Compiled dictionary has an unknown format.")
+        return None
+
+    # The offset table, the blob it points into and the rank tables must all
+    # be complete
+    blob_start = COMPILED_HEADER.size + 4 * (count + 1)
+    if len(mm) < blob_start:
+        print("[WARNING] Compiled dictionary is truncated.")
+        return None
+    blob_end = blob_start + struct.unpack_from("<I", mm, blob_start - 4)[0]
+    stats_start = blob_end + (-blob_end % 8)
+    has_stats = counts_size != 0 or counts_mtime_ns != 0
+    if len(mm) < (stats_start + 12 * count + 8 if has_stats else blob_end):
+        print("[WARNING] Compiled dictionary is truncated.")
+        return None
+    ranks_start = stats_start + 8 * (count + 1)
+    if has_stats:
+        top_completions, top_key = unpack_top_completions(mm, ranks_start + 4 * count)
+        if top_completions is None:
+            print("[WARNING] Compiled dictionary is truncated.")
+            return None
+
+    if src_path is not None and os.path.exists(src_path):
+        st = os.stat(src_path)
+        if st.st_size != src_size or st.st_mtime_ns != src_mtime_ns:
+            print("[WARNING] Compiled dictionary is stale - rebuild with: python -m modules.word_index")
+            return None
+
+    index = WordIndex(MappedWords(mm, count), is_sorted=True)
+    if counts_path is None:
+        return index
+    if not has_stats or not os.path.exists(counts_path) or file_stamp(counts_path) != (counts_size, counts_mtime_ns):
+        print("[INFO] Compiled dictionary has no ranks for the configured word counts - "
+              "rebuild with: python -m modules.word_index --counts <path> for a faster start")
+        return index
+    view = memoryview(mm)
+    index.cumulative = view[stats_start:ranks_start].cast("d")
+    index.ranks = view[ranks_start:ranks_start + 4 * count].cast("I")
+    index.top_completions, index.top_completions_key = top_completions, top_key
+    return index
+
+
+class MappedWords:
+    def __init__(self, mm, count):
+        self.mm = mm
+        self.count = count
+        start = COMPILED_HEADER.size
+        self.blob_start = start + 4 * (count + 1)
+        self.offsets = memoryview(mm)[start:self.blob_start].cast("I")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        start = self.blob_start + self.offsets[i]
+        end = self.blob_start + self.offsets[i + 1]
+        return self.mm[start:end].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+class WordIndex:
+    def __init__(self, words, cache_size=4096, is_sorted=False):
+        self.words = words if is_sorted else sorted(set(words))
+        self.cache_size = cache_size
+        self._next_cache = {}
+        # Precomputed word_ranks/cumulative_weights from a compiled index,
+        # and the WordPredictor table with the (keep, scan_limit) it was built for
+        self.ranks = None
+        self.cumulative = None
+        self.top_completions = None
+        self.top_completions_key = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __contains__(self, word):
+        i = bisect.bisect_left(self.words, word)
+        return i < len(self.words) and self.words[i] == word
+
+    def prefix_range(self, prefix, lo=0, hi=None):
+        if hi is None:
+            hi = len(self.words)
+        start = bisect.bisect_left(self.words, prefix, lo, hi)
+        end = bisect.bisect_left(self.words, prefix + PREFIX_END, start, hi)
+        return start, end
+
+    def next_letters(self, prefix):
+        cached = self._next_cache.get(prefix)
+        if cached is not None:
+            return cached
+
+        lo, hi = self.prefix_range(prefix)
+        n = len(prefix)
+        # The prefix itself (if it is a word) sorts first and has no next letter
+        if lo < hi and len(self.words[lo]) == n:
+            lo += 1
+
+        # Jump from one next-letter block to the following one instead of
+        # walking every word under the prefix
+        letters = set()
+        while lo < hi:
+            letter = self.words[lo][n]
+            letters.add(letter)
+            lo = bisect.bisect_left(self.words, prefix + letter + PREFIX_END, lo, hi)
+
+        letters = frozenset(letters)
+        if len(self._next_cache) >= self.cache_size:
+            self._next_cache.clear()
+        self._next_cache[prefix] = letters
+        return letters
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    default_src = os.path.join(here, "..", "assets", "dict", "american-english")
+    default_counts = os.path.join(here, "..", "assets", "dict", "word-counts.txt")
+    parser = argparse.ArgumentParser(description="Compile the word list into a memory-mapped index")
+    parser.add_argument("src", nargs="?", default=default_src)
+    parser.add_argument("dst", nargs="?")
+    parser.add_argument("--counts", default=default_counts if os.path.exists(default_counts) else None,
+                        help="unigram counts to precompute completion ranks from (default: the shipped list)")
+    parser.add_argument("--no-counts", action="store_true", help="compile the words only")
+    args = parser.parse_args()
+    dst = args.dst or args.src + ".idx"
+    counts = None if args.no_counts else args.counts
+    count = compile_dictionary(args.src, dst, counts)
+    with_counts = f" with ranks from {counts}" if counts else ""
+    print(f"[INFO] Compiled {count} words to {dst}{with_counts} ({os.path.getsize(dst) / 1024:.0f} KiB)")
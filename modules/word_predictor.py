@@ -0,0 +1,83 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# modules/word_predictor.py
+import bisect
+import heapq
+import time
+from modules.word_index import PREFIX_END, word_ranks
+
+
+class WordPredictor:
+    # Top-K completions of a partial word over a WordIndex. Words are ranked
+    # by unigram count, then shorter first, then alphabetically. The best
+    # completions of every prefix that covers more than scan_limit words are
+    # kept in a table so no keystroke has to merge them: a compiled index
+    # carries the ranks and that table, otherwise both are computed up
+    # front. Smaller prefix ranges are cheap enough to rank on demand.
+    def __init__(self, word_index, counts=None, top_k=3, scan_limit=64):
+        self.index = word_index
+        self.words = word_index.words
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        # One extra so the typed word itself can be left out
+        self.keep = top_k + 1
+
+        started = time.perf_counter()
+        self.ranks = word_index.ranks if word_index.ranks is not None else word_ranks(self.words, counts)
+        stored = word_index.top_completions
+        keep, limit = word_index.top_completions_key or (0, 0)
+        if stored is not None and keep >= self.keep and limit == scan_limit:
+            # Stored best-first, so the first keep entries are the top keep
+            self.table = {prefix: best[:self.keep] for prefix, best in stored.items()}
+        else:
+            self.table = {}
+            self._top("", 0, len(self.words))
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    def _best(self, candidates):
+        return heapq.nsmallest(self.keep, candidates, key=self.ranks.__getitem__)
+
+    def _top(self, prefix, lo, hi):
+        if hi - lo <= self.scan_limit:
+            return self._best(range(lo, hi))
+        best = self.table.get(prefix)
+        if best is not None:
+            return best
+
+        n = len(prefix)
+        candidates = []
+        if len(self.words[lo]) == n:
+            candidates.append(lo)
+            lo += 1
+        # Merge the best of each next-letter block
+        while lo < hi:
+            child = prefix + self.words[lo][n]
+            end = bisect.bisect_left(self.words, child + PREFIX_END, lo, hi)
+            candidates.extend(self._top(child, lo, end))
+            lo = end
+
+        best = self.table[prefix] = self._best(candidates)
+        return best
+
+    def complete(self, prefix):
+        lo, hi = self.index.prefix_range(prefix)
+        best = self._top(prefix, lo, hi)
+        words = [self.words[i] for i in best]
+        return [word for word in words if word != prefix][:self.top_k]
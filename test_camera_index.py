@@ -17,22 +17,53 @@
 # │ Commercial Use: Contact blakekemp01@gmail.com                               │
 # └────────────────────────────────────────────────────────────────────────────┘
 
+# test_camera_index.py
+#
+# Headless camera probe: lists every working device with the pixel format,
+# size and frame rate it negotiates, without opening any windows.
+#   python test_camera_index.py [--devices N] [--save] [--show INDEX]
+# --save caches the first working device in config/settings.yaml so the app
+# skips probing on the next start; --show opens a live preview of one device.
+import argparse
 import cv2
 
-for i in range(3):
-    print(f"[INFO] Testing camera index {i}...")
-    cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
-    if cap.isOpened():
-        print(f"\n[INFO] Showing live feed from index {i} — Press ESC to close\n")
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("[INFO] Failed to grab frame.")
-                break
-            cv2.imshow(f"Camera {i}", frame)
-            if cv2.waitKey(1) == 27:
-                break
-        cap.release()
-        cv2.destroyAllWindows()
+from modules.camera import FOURCCS, open_capture, probe_devices, requested_mode, save_probed_mode
+from modules.settings import load_settings
+
+
+def show(device, requested):
+    cap, mode = open_capture(device, requested["width"], requested["height"], requested["fps"])
+    if cap is None:
+        print(f"[INFO] Camera index {device} could not be opened.")
+        return
+    print(f"\n[INFO] Showing live feed from index {device} — Press ESC to close\n")
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            print("[INFO] Failed to grab frame.")
+            break
+        cv2.imshow(f"Camera {device}", frame)
+        if cv2.waitKey(1) == 27:
+            break
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find working cameras and the mode each one negotiates")
+    parser.add_argument("--devices", type=int, default=4, help="probe indices 0..N-1")
+    parser.add_argument("--save", action="store_true", help="cache the first working device in config/settings.yaml")
+    parser.add_argument("--show", type=int, metavar="INDEX", help="open a live preview of this device")
+    args = parser.parse_args()
+
+    camera_settings = load_settings().get("camera", {})
+    requested = requested_mode(camera_settings)
+    if args.show is not None:
+        show(args.show, requested)
     else:
-        print(f"[INFO] Camera index {i} could not be opened.")
+        modes = probe_devices(range(args.devices), requested["width"], requested["height"], requested["fps"],
+                              camera_settings.get("fourcc", FOURCCS))
+        if not modes:
+            print("[INFO] No working camera found.")
+        elif args.save:
+            save_probed_mode(dict(modes[0], requested=requested))
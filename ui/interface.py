@@ -21,9 +21,33 @@ import cv2
 import os
 import yaml
 import time
+from modules.word_index import WordIndex, load_compiled, read_unigram_counts, read_word_list
+from modules.word_predictor import WordPredictor
+from modules.scan_planner import ScanPlanner
+from modules.scheduler import Scheduler
+from modules.sysinfo import resident_memory_mb
+from modules.frame_pool import FramePool
+from ui.layer_cache import LayerCache
+
+ALL_KEYS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ./-")
+
+# Frame size the layout measurements were designed for
+BASE_WIDTH, BASE_HEIGHT = 640, 480
+
+# Prediction slots are two cells wide and share the row left of QUIT
+MAX_PREDICTIONS = 4
+
+# linear: fixed keyboard order, the cursor carries on from the last key
+# adaptive: most likely next key first, restarting after every character
+# row_column: pick a row (most likely first), then a key within it
+SCAN_MODES = ("linear", "adaptive", "row_column")
+# Adaptive scans reach PHRASES after this many entries, however many keys
+# are valid: the phrase panel holds the most urgent messages
+ADAPTIVE_PHRASES_POSITION = 3
 
 class EyeSpeakInterface:
-    def __init__(self):
+    def __init__(self, prediction_settings=None, scan_settings=None):
+        scan_settings = scan_settings or {}
         self.layout = [
             list("QWERTYUIOP"),
             list("ASDFGHJKL"),
@@ -32,10 +56,22 @@ class EyeSpeakInterface:
         self.special_buttons = ["PHRASES", "QUIT"]
         self.cell_width = 60
         self.cell_height = 60
+        self.ui_scale = 1.0
         self.text_buffer = ""
-        self.blink_cooldown = 0
+        # Scan timing: a highlighted entry stays solid green for linger_green
+        # seconds, flashes for linger_flash seconds, then the scan moves on;
+        # the YES/NO prompt toggles every scan_interval seconds
+        self.scheduler = Scheduler()
+        self.scan_interval = scan_settings.get("interval", 1.5)
+        self.linger_green = scan_settings.get("linger_green", 1.0)
+        self.linger_flash = scan_settings.get("linger_flash", 1.5)
+        # Blinks within this many seconds of a selection are ignored
+        self.blink_cooldown = scan_settings.get("blink_cooldown", 0)
+        # Optional EventLog for scan steps and commits
+        self.events = None
         self.selection_mode = False
         self.pending_char = None
+        self.pending_word = False
         self.confirm_options = ["YES", "NO"]
         self.confirm_index = 0
         self.key_index = 0
@@ -46,30 +82,63 @@ class EyeSpeakInterface:
         self.visible_phrase_rows = 5
         self.visible_phrase_cols = 3
         self.visible_phrases = self.visible_phrase_rows * self.visible_phrase_cols
-        self.words = self.load_dictionary()
-        self.valid_keys = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ./-")
+        prediction_settings = prediction_settings or {}
+        counts_path = self.resolve_counts_path(prediction_settings.get("counts_path"))
+        self.word_index = self.load_dictionary(counts_path)
+        self.valid_keys = ALL_KEYS
+        self.valid_keys_buffer = None
+        # A compiled index built from the same counts already carries the ranks
+        self.word_counts = self.load_word_counts(counts_path) if self.word_index.ranks is None else None
+        self.predictor = self.load_predictor(prediction_settings)
+        self.predictions = ()
+        self.scan_mode = scan_settings.get("mode", "linear")
+        if self.scan_mode not in SCAN_MODES:
+            print(f"[WARNING] Unknown scan mode {self.scan_mode!r} - using linear")
+            self.scan_mode = "linear"
+        self.planner = ScanPlanner(self.word_index, self.word_counts) if self.scan_mode != "linear" else None
+        # Row/column scanning: the entries of each row, and the row being
+        # scanned (None while choosing a row)
+        self.scan_rows = []
+        self.scan_groups = {}
+        self.scan_group = None
+        # Both caches build on the UI thread, so they can share one canvas
+        self.layer_pool = FramePool()
+        self.keyboard_layers = LayerCache(frame_pool=self.layer_pool)
+        self.phrase_font = cv2.FONT_HERSHEY_SIMPLEX
+        self.phrase_font_scale = 0.6
+        self.phrase_layout_cache = {}
+        self.phrase_layers = LayerCache(frame_pool=self.layer_pool)
+        self.phrases_mtime = None
         self.phrases = self.load_phrases()
         self.quit_confirm = False
         self.quit_index = 0
         self.linger_mode = False
         self.linger_started_at = 0
+        self.flash_started_at = 0
         self.linger_phase = "green"
         self.last_highlighted_index = None
         self.key_order = self.generate_key_order()
+        # Prediction slots come first but are empty until a word is started
+        self.key_index = self.key_order.index(("KEY", self.layout[0][0]))
 
     def get_highlight_color(self, current_index, default_color=(0, 255, 0)):
         if self.linger_mode and self.last_highlighted_index == current_index:
             if self.linger_phase == "green":
                 return default_color  # solid green
             elif self.linger_phase == "flash":
-                flash_cycle = int((time.time() * 6) % 2)
+                flash_cycle = int(((self.scheduler.now() - self.flash_started_at) * 6) % 2)
                 return (0, 255, 255) if flash_cycle == 0 else (255, 255, 255)
         return default_color
 
+    def phrases_path(self):
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), "phrases.yml")
+
     def load_phrases(self):
+        self.phrase_layout_cache.clear()
+        self.phrase_layers.clear()
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            path = os.path.join(current_dir, "phrases.yml")
+            path = self.phrases_path()
+            self.phrases_mtime = os.path.getmtime(path)
             with open(path, "r") as f:
                 data = yaml.safe_load(f)
                 return [str(p) for p in data.get("phrases", [])]
@@ -77,35 +146,132 @@ class EyeSpeakInterface:
             print(f" [ERROR] Could not load phrases.yml: {e}")
             return []
 
-    def load_dictionary(self):
+    def reload_phrases_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.phrases_path())
+        except OSError:
+            return False
+        if mtime == self.phrases_mtime:
+            return False
+        print("[INFO] phrases.yml changed - reloading")
+        self.phrases = self.load_phrases()
+        return True
+
+    def resolve_counts_path(self, path):
+        # Relative paths are relative to the project folder
+        if not path or os.path.isabs(path):
+            return path
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        dict_path = os.path.join(current_dir, "..", "assets", "dict", "american-english")
+        return os.path.normpath(os.path.join(current_dir, "..", path))
 
-        if os.path.exists(dict_path):
-            with open(dict_path, "r") as f:
-                return set(word.strip().upper() for word in f if word.strip().isalpha())
+    def load_dictionary(self, counts_path=None):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        dict_path = os.path.join(current_dir, "..", "assets", "dict", "american-english")
+        start = time.perf_counter()
+
+        # Prefer the precompiled, memory-mapped word list built by modules/word_index.py
+        index = load_compiled(dict_path + ".idx", dict_path, counts_path)
+        source = "compiled"
+        if index is None and os.path.exists(dict_path):
+            index = WordIndex(read_word_list(dict_path))
+            source = "text"
+
+        if index is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            rss = resident_memory_mb()
+            rss_text = f", RSS {rss:.1f} MB" if rss is not None else ""
+            print(f"[INFO] Loaded {len(index)} words from {source} dictionary in {elapsed_ms:.1f} ms{rss_text}")
+            return index
 
         print("⚠️ Dictionary not found. Falling back to defaults.")
-        return {"HELLO", "YES", "NO", "PLEASE", "THANK", "YOU", "HELP", "STOP", "GO", "LOVE"}
+        return WordIndex({"HELLO", "YES", "NO", "PLEASE", "THANK", "YOU", "HELP", "STOP", "GO", "LOVE"})
+
+    def load_word_counts(self, path):
+        if not path:
+            return None
+        try:
+            return read_unigram_counts(path)
+        except OSError as e:
+            print(f"[WARNING] Could not load word counts: {e}")
+            return None
+
+    def load_predictor(self, settings):
+        if not settings.get("enabled", True):
+            return None
+        top_k = min(settings.get("top_k", 3), MAX_PREDICTIONS)
+        predictor = WordPredictor(self.word_index, self.word_counts, top_k=top_k)
+        counts = "precomputed ranks" if self.word_index.ranks is not None else f"{len(self.word_counts or ())} word counts"
+        print(f"[INFO] Word prediction ready: top {top_k}, {counts}, built in {predictor.build_ms:.1f} ms")
+        return predictor
 
     def update_valid_keys(self):
+        # Nothing to do until the text buffer changes
+        if self.text_buffer == self.valid_keys_buffer:
+            return
+        self.valid_keys_buffer = self.text_buffer
+
         # Look at the raw text buffer, don't strip or rstrip
         if self.text_buffer.endswith(" "):
             # User just typed space — treat it as a word boundary
-            self.valid_keys = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ./-")
+            self.valid_keys = ALL_KEYS
+            self.predictions = ()
+            self.plan_scan("")
             return
 
         # Otherwise calculate next valid letters based on last word
         partial = self.text_buffer.split(" ")[-1].upper()
-        next_keys = set()
-        for word in self.words:
-            if word.startswith(partial) and len(word) > len(partial):
-                next_keys.add(word[len(partial)])
+        next_keys = self.word_index.next_letters(partial)
+        if self.predictor is not None and partial:
+            self.predictions = tuple(self.predictor.complete(partial))
+        else:
+            self.predictions = ()
 
-        self.valid_keys = next_keys.union({".", "/", "-"}) if next_keys else set("ABCDEFGHIJKLMNOPQRSTUVWXYZ./-")
+        self.valid_keys = next_keys.union({".", "/", "-"}) if next_keys else ALL_KEYS
+        self.plan_scan(partial)
+
+    def plan_scan(self, partial):
+        # Rebuild the scan for the new partial word and start it over
+        if self.planner is None:
+            return
+        probs = self.planner.probabilities(partial)
+
+        rows = []
+        if self.predictions:
+            words = [(("WORD", i), self.planner.word_probability(partial, word))
+                     for i, word in enumerate(self.predictions)]
+            rows.append((("ROW", "WORD"), words))
+        for row_idx, row in enumerate(self.layout):
+            keys = [(("KEY", key), probs.get(key, 0.0)) for key in row if key in self.valid_keys]
+            if keys:
+                rows.append((("ROW", row_idx), keys))
+        specials = [("SPECIAL", "PHRASES"), ("SPECIAL", "QUIT")]
+
+        self.scan_group = None
+        self.key_index = 0
+        if self.scan_mode == "adaptive":
+            ranked = self.planner.rank([entry for _, keys in rows for entry in keys])
+            # QUIT stays last, as in linear mode
+            self.key_order = (ranked[:ADAPTIVE_PHRASES_POSITION] + [("SPECIAL", "PHRASES")]
+                              + ranked[ADAPTIVE_PHRASES_POSITION:] + [("SPECIAL", "QUIT")])
+            return
+
+        ranked_rows = self.planner.rank([(row, sum(p for _, p in keys)) for row, keys in rows])
+        self.scan_groups = {row: self.planner.rank(keys) for row, keys in rows}
+        self.scan_rows = ranked_rows + specials
+        self.key_order = self.scan_rows
+
+    def enter_scan_group(self, row):
+        self.scan_group = row
+        self.key_order = self.scan_groups[row]
+        self.key_index = 0
+
+    def leave_scan_group(self):
+        self.scan_group = None
+        self.key_order = self.scan_rows
+        self.key_index = 0
 
     def generate_key_order(self):
-        order = []
+        order = [("WORD", i) for i in range(self.predictor.top_k if self.predictor else 0)]
         for row in self.layout:
             for key in row:
                 order.append(("KEY", key))
@@ -113,23 +279,35 @@ class EyeSpeakInterface:
         order.append(("SPECIAL", "QUIT"))
         return order
 
+    def px(self, value):
+        # Layout sizes are designed for the 640x480 camera frame; scale them
+        # to whatever frame the UI is drawn on
+        return int(round(value * self.ui_scale))
+
+    def thick(self, value):
+        return max(1, int(round(value * self.ui_scale)))
+
     def draw_ui(self, frame):       
+        h, w, _ = frame.shape
+        self.ui_scale = min(w / BASE_WIDTH, h / BASE_HEIGHT)
+        px, thick, s = self.px, self.thick, self.ui_scale
+
         if self.quit_confirm:
-            overlay = frame.copy()
+            # Drawn in place like every other screen; the caller owns frame
+            overlay = frame
             prompt =  "Are you sure you want to quit? YES / NO"
-            cv2.putText(overlay, prompt, (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+            cv2.putText(overlay, prompt, (px(50), px(100)), cv2.FONT_HERSHEY_SIMPLEX, 1 * s, (0, 0, 255), thick(2))
             for idx, option in enumerate (["YES", "NO"]):
-                x = 50 + idx * 160
-                y = 150
+                x = px(50 + idx * 160)
+                y = px(150)
                 color = (0, 255, 0) if self.quit_index == idx else (255, 255, 255)
-                cv2.rectangle(overlay, (x, y), (x + 120, y +60), color, 2)
-                cv2.putText(overlay, option, (x + 20, y +40), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+                cv2.rectangle(overlay, (x, y), (x + px(120), y + px(60)), color, thick(2))
+                cv2.putText(overlay, option, (x + px(20), y + px(40)), 
+                            cv2.FONT_HERSHEY_SIMPLEX, 1 * s, color, thick(2))
             return overlay
 
-        h, w, _ = frame.shape
-        offset_x = (w - self.cell_width * 10) // 2
-        offset_y = h - self.cell_height * 5 - 30
+        offset_x = (w - px(self.cell_width) * 10) // 2
+        offset_y = h - px(self.cell_height) * 5 - px(30)
 
         self.update_valid_keys()
 
@@ -138,58 +316,137 @@ class EyeSpeakInterface:
 
         if self.in_phrase_panel:
             return self.draw_phrase_panel(frame, offset_x, offset_y)
-        phrase_button_coords = (offset_x + 4 * self.cell_width, offset_y)
+
+        # The keyboard only changes with the valid keys, the highlighted entry
+        # and its (flashing) color, so it is rendered once per combination and
+        # composited from the cache on every other frame
+        highlight = self.key_order[self.key_index]
+        layer_key = (frame.shape, self.valid_keys, self.predictions, highlight, self.get_highlight_color(highlight))
+        self.keyboard_layers.composite(frame, layer_key,
+                                       lambda canvas: self.draw_keyboard(canvas, offset_x, offset_y))
+
+        cv2.putText(frame, self.text_buffer, (px(20), px(50)), cv2.FONT_HERSHEY_SIMPLEX, 1.2 * s, (0, 255, 255), thick(2))
+        return frame
+
+    def draw_keyboard(self, frame, offset_x, offset_y):
+        px, thick, s = self.px, self.thick, self.ui_scale
+        cw, ch = px(self.cell_width), px(self.cell_height)
+
+        phrase_button_coords = (offset_x + 4 * cw, offset_y)
         phrase_color = self.get_highlight_color(("SPECIAL", "PHRASES")) if self.is_phrase_selected() else (255, 255, 255)
         cv2.rectangle(frame, phrase_button_coords, 
-                      (phrase_button_coords[0] + 2 * self.cell_width, phrase_button_coords[1] + self.cell_height), 
-                      phrase_color, 2)
-        cv2.putText(frame, "PHRASES", (phrase_button_coords[0] + 2, phrase_button_coords[1] + 40), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, phrase_color, 2)
+                      (phrase_button_coords[0] + 2 * cw, phrase_button_coords[1] + ch), 
+                      phrase_color, thick(2))
+        cv2.putText(frame, "PHRASES", (phrase_button_coords[0] + px(2), phrase_button_coords[1] + px(40)), 
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8 * s, phrase_color, thick(2))
 
         for row_idx, row in enumerate(self.layout):
             for col_idx, char in enumerate(row):
-                x1 = offset_x + col_idx * self.cell_width
-                y1 = offset_y + (row_idx + 1) * self.cell_height
-                x2 = x1 + self.cell_width
-                y2 = y1 + self.cell_height
-                highlighted = self.key_order[self.key_index] == ("KEY", char)
+                x1 = offset_x + col_idx * cw
+                y1 = offset_y + (row_idx + 1) * ch
+                x2 = x1 + cw
+                y2 = y1 + ch
+                current = self.key_order[self.key_index]
+                highlighted = current == ("KEY", char) or current == ("ROW", row_idx)
                 enabled = char.upper() in self.valid_keys
                 if highlighted and enabled:
-                    color = self.get_highlight_color(("KEY", char))
+                    color = self.get_highlight_color(current)
                 elif not enabled:
                     color = (100, 100, 100)
                 else:
                     color = (255, 255, 255)
                 thickness = 2 if enabled else 1
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3 if highlighted and enabled else thickness)
-                cv2.putText(frame, char, (x1 + 15, y1 + 45), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, thick(3 if highlighted and enabled else thickness))
+                cv2.putText(frame, char, (x1 + px(15), y1 + px(45)), cv2.FONT_HERSHEY_SIMPLEX, 1 * s, color, thick(2))
         
+        # Word predictions, in the row left of QUIT
+        for slot, word in enumerate(self.predictions):
+            x = offset_x + 2 * slot * cw
+            y = offset_y - ch
+            current = self.key_order[self.key_index]
+            highlighted = current == ("WORD", slot) or current == ("ROW", "WORD")
+            color = self.get_highlight_color(current) if highlighted else (255, 255, 255)
+            cv2.rectangle(frame, (x, y), (x + 2 * cw, y + ch), color, thick(3 if highlighted else 2))
+            # Shrink long words to fit the slot
+            font_scale = 0.7 * s
+            (text_width, _), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thick(2))
+            if text_width > 2 * cw - px(10):
+                font_scale *= (2 * cw - px(10)) / text_width
+            cv2.putText(frame, word, (x + px(5), y + px(38)), cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, thick(2))
+
         # Draw QUIT button
-        x = offset_x + 8 * self.cell_width
-        y = offset_y - self.cell_height
+        x = offset_x + 8 * cw
+        y = offset_y - ch
         highlighted = self.key_order[self.key_index] == ("SPECIAL", "QUIT")
         color = self.get_highlight_color(("SPECIAL", "QUIT")) if highlighted else (255, 255, 255)
-        cv2.rectangle(frame, (x, y), (x + 2 * self.cell_width, y + self.cell_height), color, 2)
-        cv2.putText(frame, "QUIT", (x + 5, y + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
-
-        cv2.putText(frame, self.text_buffer, (20, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 2)
+        cv2.rectangle(frame, (x, y), (x + 2 * cw, y + ch), color, thick(2))
+        cv2.putText(frame, "QUIT", (x + px(5), y + px(40)), cv2.FONT_HERSHEY_SIMPLEX, 0.8 * s, color, thick(2))
         return frame
 
     def draw_phrase_panel(self, frame, offset_x, offset_y):
+        # The whole page is one cached layer; it changes only with the page,
+        # the highlighted button and its color, the phrases or the font
+        highlight = ("PHRASE", self.phrase_index)
+        start = self.phrase_scroll_offset
+        page = tuple(self.phrases[start:start + self.visible_phrases])
+        layer_key = (frame.shape, offset_y, page, len(self.phrases), self.phrase_font, self.phrase_font_scale,
+                     start, self.phrase_index, self.get_highlight_color(highlight))
+        return self.phrase_layers.composite(frame, layer_key,
+                                            lambda canvas: self.render_phrase_panel(canvas, offset_x, offset_y))
+
+    def phrase_layout(self, phrase, box_width, font_scale):
+        key = (phrase, self.phrase_font, font_scale, box_width)
+        lines = self.phrase_layout_cache.get(key)
+        if lines is None:
+            lines = self.phrase_layout_cache[key] = self.wrap_phrase(phrase, box_width, font_scale)
+        return lines
+
+    def wrap_phrase(self, phrase, box_width, font_scale):
+        font = self.phrase_font
+
+        # Word wrapping
+        words = phrase.split()
+        line1, line2 = "", ""
+        current_line = ""
+
+        for word in words:
+            test_line = current_line + (" " if current_line else "") + word
+            (text_width, _), _ = cv2.getTextSize(test_line, font, font_scale, self.thick(1))
+            if text_width < box_width - self.px(10):
+                current_line = test_line
+            elif not line1:
+                line1 = current_line
+                current_line = word
+            else:
+                line2 = current_line
+                break
+
+        if not line1:
+            line1 = current_line
+            line2 = ""
+        elif not line2:
+            line2 = current_line
+        else:
+            line2 = line2[:max(0, len(line2) - 3)] + "..."
+
+        return line1.strip(), line2.strip()
+
+    def render_phrase_panel(self, frame, offset_x, offset_y):
+        px, thick, s = self.px, self.thick, self.ui_scale
         title = "Select a Phrase:"
-        font_scale = 0.6
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        thickness = 2
+        font_scale = self.phrase_font_scale * s
+        font = self.phrase_font
+        thickness = thick(2)
         (text_width, _), _ = cv2.getTextSize(title, font, font_scale, thickness)
         center_x = frame.shape[1] // 2
         title_x = center_x - text_width // 2
-        title_y = offset_y - 10
+        title_y = offset_y - px(10)
         w = frame.shape[1]
         columns = 3
-        col_spacing = 230
-        row_spacing = 50
-        box_width = 180
-        box_height = 48
+        col_spacing = px(230)
+        row_spacing = px(50)
+        box_width = px(180)
+        box_height = px(48)
         panel_width = (columns - 1) * col_spacing + box_width
         offset_x = (w - panel_width) // 2
 
@@ -197,8 +454,8 @@ class EyeSpeakInterface:
                     font, font_scale, (255, 255, 0), thickness)
 
         if not self.phrases:
-            cv2.putText(frame, "⚠ No phrases found.", (offset_x, offset_y + 40),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+            cv2.putText(frame, "⚠ No phrases found.", (offset_x, offset_y + px(40)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6 * s, (0, 0, 255), thick(2))
             return frame
 
         max_rows_per_col = 5
@@ -215,10 +472,10 @@ class EyeSpeakInterface:
 
         # BACK button
         back_x = offset_x
-        back_y = offset_y - 70
+        back_y = offset_y - px(70)
         back_color = self.get_highlight_color(("PHRASE", -1)) if highlight_index == -1 else (255, 255, 255)
-        cv2.rectangle(frame, (back_x, back_y), (back_x + box_width, back_y + box_height), back_color, 2)
-        cv2.putText(frame, "BACK", (back_x + 10, back_y + 25), font, 0.6, back_color, 2)
+        cv2.rectangle(frame, (back_x, back_y), (back_x + box_width, back_y + box_height), back_color, thick(2))
+        cv2.putText(frame, "BACK", (back_x + px(10), back_y + px(25)), font, 0.6 * s, back_color, thick(2))
 
         # Phrase buttons
         for i, phrase in enumerate(visible_items):
@@ -227,82 +484,78 @@ class EyeSpeakInterface:
             x = offset_x + col * col_spacing
             y = offset_y + row * row_spacing
             color = self.get_highlight_color(("PHRASE", i)) if highlight_index == i else (255, 255, 255)
-            cv2.rectangle(frame, (x, y), (x + box_width, y + box_height), color, 2)
-
-            # Word wrapping
-            words = phrase.split()
-            line1, line2 = "", ""
-            current_line = ""
-
-            for word in words:
-                test_line = current_line + (" " if current_line else "") + word
-                (text_width, _), _ = cv2.getTextSize(test_line, font, font_scale, 1)
-                if text_width < box_width - 10:
-                    current_line = test_line
-                elif not line1:
-                    line1 = current_line
-                    current_line = word
-                else:
-                    line2 = current_line
-                    break
+            cv2.rectangle(frame, (x, y), (x + box_width, y + box_height), color, thick(2))
 
-            if not line1:
-                line1 = current_line
-                line2 = ""
-            elif not line2:
-                line2 = current_line
-            else:
-                line2 = line2[:max(0, len(line2) - 3)] + "..."
+            line1, line2 = self.phrase_layout(phrase, box_width, font_scale)
 
-            cv2.putText(frame, line1.strip(), (x + 5, y + 18), font, font_scale, color, 1)
-            if line2.strip():
-                cv2.putText(frame, line2.strip(), (x + 5, y + 35), font, font_scale, color, 1)
+            cv2.putText(frame, line1, (x + px(5), y + px(18)), font, font_scale, color, thick(1))
+            if line2:
+                cv2.putText(frame, line2, (x + px(5), y + px(35)), font, font_scale, color, thick(1))
 
         # NEXT PAGE button
         if has_next_page:
             next_index = len(visible_items)
             next_x = offset_x + (columns - 1) * col_spacing
-            next_y = offset_y + max_rows_per_col * row_spacing + 10
+            next_y = offset_y + max_rows_per_col * row_spacing + px(10)
             next_color = self.get_highlight_color(("PHRASE", next_index)) if highlight_index == next_index else (255, 255, 255)
-            cv2.rectangle(frame, (next_x, next_y), (next_x + 100, next_y + 40), next_color, 2)
-            cv2.putText(frame, "NEXT", (next_x + 10, next_y + 28), font, 0.8, next_color, 2)
+            cv2.rectangle(frame, (next_x, next_y), (next_x + px(100), next_y + px(40)), next_color, thick(2))
+            cv2.putText(frame, "NEXT", (next_x + px(10), next_y + px(28)), font, 0.8 * s, next_color, thick(2))
 
         return frame
 
     def draw_confirm_ui(self, frame, offset_x, offset_y):
+        px, thick, s = self.px, self.thick, self.ui_scale
+        cw, ch = px(self.cell_width), px(self.cell_height)
         prompt = f"Select '{self.pending_char}'? YES / NO"
-        cv2.putText(frame, prompt, (offset_x, offset_y - 20), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+        cv2.putText(frame, prompt, (offset_x, offset_y - px(20)), cv2.FONT_HERSHEY_SIMPLEX, 1 * s, (255, 0, 0), thick(2))
         for idx, option in enumerate(self.confirm_options):
-            x1 = offset_x + idx * (self.cell_width + 20)
+            x1 = offset_x + idx * (cw + px(20))
             y1 = offset_y
-            x2 = x1 + self.cell_width
-            y2 = y1 + self.cell_height
+            x2 = x1 + cw
+            y2 = y1 + ch
             color = (0, 255, 0) if idx == self.confirm_index else (255, 255, 255)
-            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-            cv2.putText(frame, option, (x1 + 5, y1 + 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), color, thick(2))
+            cv2.putText(frame, option, (x1 + px(5), y1 + px(40)), cv2.FONT_HERSHEY_SIMPLEX, 1 * s, color, thick(2))
         return frame
 
-    def advance_key(self):
-        now = time.time()
-        if self.linger_mode:
-            # Stay in green phase for 1s before starting to flash
-            if self.linger_phase == "green":
-                if now - self.linger_started_at >= 1.0:
-                    self.linger_phase = "flash"
-                return
-            elif self.linger_phase == "flash":
-                # After 1.5s of flashing, advance
-                if now - self.linger_started_at >= 2.5:
-                    self.linger_mode = False
-                    self.linger_phase = "green"
-                    return
+    def tick(self):
+        # Call once per frame: runs whatever scan events are due
+        sched = self.scheduler
+        now = sched.now()
+        if sched.due("linger_flash", now):
+            self.linger_phase = "flash"
+            self.flash_started_at = now
+        sched.due("blink_cooldown", now)
+
+        if not sched.pending("scan"):
+            sched.after("scan", self.scan_interval)
+        elif sched.due("scan", now):
+            if not self.selection_mode:
+                if not self.just_spoke_phrase:
+                    self.advance_key()
+            else:
+                self.toggle_confirmation()
+            sched.then("scan", self.linger_green + self.linger_flash if self.linger_mode else self.scan_interval)
 
+    def start_linger(self, entry):
+        self.last_highlighted_index = entry
+        self.linger_mode = True  # First frame = solid green
+        self.linger_started_at = self.scheduler.now()
+        self.linger_phase = "green"
+        self.scheduler.after("linger_flash", self.linger_green)
+
+    def blink_ready(self):
+        return not self.scheduler.pending("blink_cooldown") or self.scheduler.due("blink_cooldown")
+
+    def log_event(self, kind, **fields):
+        if self.events is not None:
+            self.events.log(kind, **fields)
+
+    def advance_key(self):
         if self.quit_confirm:
             self.quit_index = (self.quit_index + 1) % 2
-            self.last_highlighted_index = ("SPECIAL", "QUIT")
-            self.linger_mode = True  # NEXT frame will flash
-            self.linger_started_at = now
-            self.linger_phase = "green"
+            self.start_linger(("SPECIAL", "QUIT"))
+            self.log_event("step", screen="quit")
             return
 
         if self.selection_mode:
@@ -319,26 +572,33 @@ class EyeSpeakInterface:
             if self.phrase_index >= total_options:
                 self.phrase_index = -1  # wrap to BACK
 
-            self.last_highlighted_index = ("PHRASE", self.phrase_index)
-            self.linger_mode = True  # First frame = solid green
-            self.linger_started_at = now
-            self.linger_phase = "green"
+            self.start_linger(("PHRASE", self.phrase_index))
+            self.log_event("step", screen="phrases")
         else:
-            tries = 0
-            while tries < len(self.key_order):
-                self.key_index = (self.key_index + 1) % len(self.key_order)
-                kind, value = self.key_order[self.key_index]
-                if kind == "SPECIAL" or value in self.valid_keys:
-                    break
-                tries += 1
-
-            self.last_highlighted_index = self.key_order[self.key_index]
-            self.linger_mode = True  # First frame = solid green
-            self.linger_started_at = now
-            self.linger_phase = "green"
+            if self.scan_group is not None and self.key_index + 1 >= len(self.key_order):
+                # A full pass through the row without a selection
+                self.leave_scan_group()
+            else:
+                tries = 0
+                while tries < len(self.key_order):
+                    self.key_index = (self.key_index + 1) % len(self.key_order)
+                    kind, value = self.key_order[self.key_index]
+                    if kind in ("SPECIAL", "ROW") or value in self.valid_keys:
+                        break
+                    if kind == "WORD" and value < len(self.predictions):
+                        break
+                    tries += 1
+
+            self.start_linger(self.key_order[self.key_index])
+            self.log_event("step", screen="keyboard")
 
     def blink_triggered(self):
         self.linger_mode = False
+        self.scheduler.cancel("linger_flash")
+        # Give whatever comes up next a full scan step
+        self.scheduler.after("scan", self.scan_interval)
+        if self.blink_cooldown > 0:
+            self.scheduler.after("blink_cooldown", self.blink_cooldown)
 
         if self.quit_confirm:
             if self.quit_index == 0:
@@ -351,8 +611,10 @@ class EyeSpeakInterface:
         if self.selection_mode:
             if self.confirm_options[self.confirm_index] == "YES":
                 return self.commit_char()
+            self.log_event("cancel")
             self.selection_mode = False
             self.pending_char = None
+            self.pending_word = False
             self.confirm_index = 0
             return None
 
@@ -389,8 +651,12 @@ class EyeSpeakInterface:
 
         # Regular keyboard
         kind, value = self.key_order[self.key_index]
+        if kind == "ROW":
+            self.enter_scan_group((kind, value))
+            return None
         if kind == "SPECIAL":
             if value == "PHRASES":
+                self.reload_phrases_if_changed()
                 self.in_phrase_panel = True
                 self.phrase_index = -1
                 self.phrase_scroll_offset = 0
@@ -402,11 +668,16 @@ class EyeSpeakInterface:
         if kind == "KEY" and value in self.valid_keys:
             self.pending_char = value
             self.selection_mode = True
+        elif kind == "WORD" and value < len(self.predictions):
+            self.pending_char = self.predictions[value]
+            self.pending_word = True
+            self.selection_mode = True
         return None
 
     def toggle_confirmation(self):
         if self.selection_mode:
             self.confirm_index = (self.confirm_index + 1) % len(self.confirm_options)
+            self.log_event("step", screen="confirm")
 
     def commit_char(self):
         if self.in_phrase_panel:
@@ -417,21 +688,32 @@ class EyeSpeakInterface:
             self.in_phrase_panel = False
             self.phrase_index = 0
             self.phrase_scroll_offset = 0
+            self.log_event("commit", key="PHRASE", added=0, word_end=False)
             return phrase
 
         char = self.pending_char
+        word = self.pending_word
         self.selection_mode = False
         self.pending_char = None
+        self.pending_word = False
         self.confirm_index = 0
+        before = len(self.text_buffer)
 
-        if char == ".":
+        if word:
+            # Replace the partial word with the completion and end the word
+            partial = self.text_buffer.split(" ")[-1]
+            self.text_buffer = self.text_buffer[:len(self.text_buffer) - len(partial)] + char + " "
+        elif char == ".":
             self.text_buffer += " "
         elif char == "/":
             self.text_buffer = self.text_buffer[:-1]
         elif char == "-":
+            self.log_event("commit", key=char, added=0, word_end=False)
             return "ENTER"
         else:
             self.text_buffer += char
+        self.log_event("commit", key="WORD" if word else char, added=len(self.text_buffer) - before,
+                       word_end=word or char == ".")
         return None
 
     def is_phrase_selected(self):
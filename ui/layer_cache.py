@@ -0,0 +1,76 @@
+# ┌────────────────────────────────────────────────────────────────────────────┐
+# │ EyeSpeak Assist - Blink-Based Communication System                         │
+# │ © 2025 Blake Kemp                                                          │
+# ├────────────────────────────────────────────────────────────────────────────┤
+# │ Licensed under the Creative Commons Attribution-NonCommercial 4.0         │
+# │ International License (CC BY-NC 4.0).                                      │
+# │                                                                            │
+# │ You are free to:                                                           │
+# │  • Share — copy and redistribute the material in any medium or format      │
+# │  • Adapt — remix, transform, and build upon the material                   │
+# │                                                                            │
+# │ Under the following terms:                                                 │
+# │  • Attribution — You must give appropriate credit and indicate changes     │
+# │  • NonCommercial — You may not use the material for commercial purposes    │
+# │                                                                            │
+# │ License Info: https://creativecommons.org/licenses/by-nc/4.0/              │
+# │ Commercial Use: Contact blakekemp01@gmail.com                              │
+# └────────────────────────────────────────────────────────────────────────────┘
+
+# ui/layer_cache.py
+from collections import OrderedDict
+import cv2
+import numpy as np
+from modules.frame_pool import FramePool
+
+
+class LayerCache:
+    # Pre-rendered UI layers. render(canvas) draws a layer onto a black
+    # frame-sized canvas once; afterwards the layer is kept as the cropped
+    # sprite plus a mask of the pixels it touched, and compositing is a
+    # single masked copy (cv2.copyTo, in place on the frame). The full-size
+    # canvas and its grayscale copy come from frame_pool, so a rebuild only
+    # allocates the sprite and mask it keeps.
+    def __init__(self, max_layers=16, frame_pool=None):
+        self.max_layers = max_layers
+        self.frame_pool = frame_pool or FramePool()
+        self.layers = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.layers.clear()
+
+    def composite(self, frame, key, render):
+        layer = self.layers.get(key)
+        if layer is None:
+            self.misses += 1
+            layer = self._build(frame.shape, render)
+            self.layers[key] = layer
+            if len(self.layers) > self.max_layers:
+                self.layers.popitem(last=False)
+        else:
+            self.hits += 1
+            self.layers.move_to_end(key)
+
+        bbox, sprite, mask = layer
+        if bbox is None:
+            return frame
+        x1, y1, x2, y2 = bbox
+        cv2.copyTo(sprite, mask, frame[y1:y2, x1:x2])
+        return frame
+
+    def _build(self, shape, render):
+        canvas = self.frame_pool.get("layer_canvas", shape)
+        canvas.fill(0)
+        render(canvas)
+        # Every UI color has a channel >= 100, so anything drawn is non-zero
+        # in grayscale as well
+        gray = cv2.cvtColor(canvas, cv2.COLOR_BGR2GRAY, dst=self.frame_pool.get("layer_gray", shape[:2]))
+        x, y, w, h = cv2.boundingRect(gray)
+        if w == 0 or h == 0:
+            return None, None, None
+        sprite = canvas[y:y + h, x:x + w].copy()
+        mask = np.empty((h, w), dtype=np.uint8)
+        cv2.threshold(gray[y:y + h, x:x + w], 0, 1, cv2.THRESH_BINARY, dst=mask)
+        return (x, y, x + w, y + h), sprite, mask